@@ -1,54 +1,110 @@
 import os
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
-from supabase import create_client, Client
-from typing import Optional
+import httpx
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
+from supabase import acreate_client, AsyncClient, AsyncClientOptions
+from typing import Annotated, List, Optional
 
-# Load environment variables from .env file in the api directory
+# Environment variables are read from the .env file in the api directory
 api_dir = Path(__file__).parent.parent.parent
 env_path = api_dir / ".env"
-load_dotenv(env_path)
-
-
-class Settings:
-    def __init__(self):
-        self.supabase_url: str = os.getenv("SUPABASE_URL", "")
-        self.supabase_anon_key: str = os.getenv("SUPABASE_ANON_KEY", "")
-        self.supabase_service_role_key: str = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
-        self.api_host: str = os.getenv("API_HOST", "127.0.0.1")
-        self.api_port: int = int(os.getenv("API_PORT", "8000"))
-        self.debug: bool = os.getenv("DEBUG", "false").lower() == "true"
-        self.allowed_origins: list = os.getenv("ALLOWED_ORIGINS", "").split(",")
-        self.testing: bool = os.getenv("TESTING", "false").lower() == "true"
-        
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=env_path, extra="ignore", frozen=True)
+
+    supabase_url: str = ""
+    supabase_anon_key: str = ""
+    supabase_service_role_key: str = ""
+    api_host: str = "127.0.0.1"
+    api_port: int = 8000
+    debug: bool = False
+    allowed_origins: Annotated[List[str], NoDecode] = []
+    testing: bool = False
+    # Database URL if using direct PostgreSQL connection
+    database_url: Optional[str] = None
+
+    @field_validator("allowed_origins", mode="before")
+    @classmethod
+    def split_allowed_origins(cls, value):
+        """ALLOWED_ORIGINS is a comma-separated list; blank entries are dropped"""
+        if isinstance(value, str):
+            return [origin.strip() for origin in value.split(",") if origin.strip()]
+        return value
+
+    def model_post_init(self, __context) -> None:
         # Validate required environment variables
         if not self.testing and (not self.supabase_url or not self.supabase_anon_key):
             print(f"Warning: SUPABASE_URL and SUPABASE_ANON_KEY are not set. Available env vars: {list(os.environ.keys())}")
             # Don't raise error, just warn - let it fail at runtime if needed
-            # raise ValueError("SUPABASE_URL and SUPABASE_ANON_KEY must be set in environment variables")
 
-    @property
-    def database_url(self) -> Optional[str]:
-        """Get database URL if using direct PostgreSQL connection"""
-        return os.getenv("DATABASE_URL")
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get application settings, parsed once per process"""
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
+
+
+# Shared HTTP transport for all Supabase clients
+# Bounded so concurrent requests cannot exhaust the Supabase connection pooler
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.AsyncClient:
+    """Get the pooled httpx client used underneath PostgREST"""
+    # HTTP/2 multiplexes concurrent queries over one TLS connection, kept alive between requests
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=10, max_keepalive_connections=10, keepalive_expiry=60),
+        timeout=httpx.Timeout(30.0, connect=10.0),
+    )
 
 
 # Supabase client instances
-def get_supabase_client() -> Client:
+# Created once so every request shares one client (and its underlying connection pool)
+_client: Optional[AsyncClient] = None
+_admin_client: Optional[AsyncClient] = None
+
+
+async def get_supabase_client() -> AsyncClient:
     """Get Supabase client with anon key (for general operations)"""
+    global _client
     if settings.testing:
         raise ValueError("Database connections are disabled during testing")
-    return create_client(settings.supabase_url, settings.supabase_anon_key)
+    if _client is None:
+        _client = await acreate_client(
+            settings.supabase_url,
+            settings.supabase_anon_key,
+            options=AsyncClientOptions(httpx_client=get_http_client()),
+        )
+    return _client
 
 
-def get_supabase_admin_client() -> Client:
+async def get_supabase_admin_client() -> AsyncClient:
     """Get Supabase client with service role key (for admin operations)"""
+    global _admin_client
     if settings.testing:
         raise ValueError("Database connections are disabled during testing")
     if not settings.supabase_service_role_key:
         raise ValueError("SUPABASE_SERVICE_ROLE_KEY must be set for admin operations")
-    return create_client(settings.supabase_url, settings.supabase_service_role_key) 
\ No newline at end of file
+    if _admin_client is None:
+        _admin_client = await acreate_client(
+            settings.supabase_url,
+            settings.supabase_service_role_key,
+            options=AsyncClientOptions(httpx_client=get_http_client()),
+        )
+    return _admin_client
+
+
+async def close_supabase_clients() -> None:
+    """Release pooled connections held by the Supabase clients"""
+    global _client, _admin_client
+    _client = None
+    _admin_client = None
+    if get_http_client.cache_info().currsize:
+        await get_http_client().aclose()
+        get_http_client.cache_clear()
@@ -1,7 +1,10 @@
-from typing import List, Optional, Dict, Any
+import asyncio
+import logging
+from typing import List, Optional, Dict, Any, Set, Tuple, Callable, Awaitable, AsyncIterator
 from uuid import UUID
-from supabase import Client
-from .config import get_supabase_client
+from cachetools import TTLCache
+from postgrest.exceptions import APIError
+from .config import get_supabase_client, close_supabase_clients
 from .models import (
     TranslationKey, 
     Translation, 
@@ -9,290 +12,415 @@ from .models import (
     TranslationKeyUpdate,
     TranslationCreate,
     TranslationUpdate,
-    BulkTranslationUpdate
+    BulkTranslationUpdate,
+    TRANSLATION_KEYS_ADAPTER,
+    TRANSLATIONS_ADAPTER,
+    BULK_TRANSLATION_UPDATES_ADAPTER
 )
 
+logger = logging.getLogger(__name__)
+
+# How long cached reads (localizations, categories) may be served before refetching. The cache
+# is per process, so other workers can serve these stale for up to this long after a write
+CACHE_TTL_SECONDS = 60
+
+# Bulk translation upserts are split into requests of this many rows, with a bounded number in flight
+BULK_UPSERT_CHUNK_SIZE = 500
+BULK_UPSERT_CONCURRENCY = 4
+
+# Streamed key listings are read from the database this many rows at a time
+STREAM_PAGE_SIZE = 500
+
+# Lookups by key string or ID go in the request URL, so IN lists are split to keep it short
+KEY_LOOKUP_CHUNK_SIZE = 200
+
+# Postgres error codes surfaced by PostgREST in APIError.code
+FOREIGN_KEY_VIOLATION = "23503"
+UNIQUE_VIOLATION = "23505"
+
+
+class TranslationKeyAlreadyExistsError(Exception):
+    """Raised when creating a translation key whose key string is already taken"""
+
+
+class TranslationAlreadyExistsError(Exception):
+    """Raised when creating a translation that already exists for the key and language"""
+
+
+def _index_translations(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a translation_keys row with embedded translations into TranslationKey fields,
+    with translations indexed by language_code so lookups are a dict access"""
+    return {
+        'id': item['id'],
+        'key': item['key'],
+        'category': item['category'],
+        'description': item.get('description'),
+        'created_at': item['created_at'],
+        'updated_at': item['updated_at'],
+        'translations': {
+            translation['language_code']: {
+                'value': translation['value'],
+                'updated_at': translation['updated_at'],
+                'updated_by': translation['updated_by']
+            }
+            for translation in item.get('translations') or []
+        }
+    }
+
 
 class DatabaseService:
     def __init__(self):
+        # Short-lived cache for read-heavy queries that change rarely (localizations, categories)
+        self._cache: TTLCache = TTLCache(maxsize=64, ttl=CACHE_TTL_SECONDS)
+        # Bumped on every invalidation, so fetches started before a write never store their result
+        self._cache_generation = 0
+        # One in-flight fetch per (generation, cache key); misses for other keys don't wait on it
+        self._cache_fetches: Dict[Tuple[int, Tuple], asyncio.Task] = {}
+
+    async def _cached(self, cache_key: Tuple, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return a cached value, fetching it at most once concurrently on a miss"""
+        value = self._cache.get(cache_key)
+        if value is not None:
+            return value
+        
+        generation = self._cache_generation
+        fetch_key = (generation, cache_key)
+        task = self._cache_fetches.get(fetch_key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_into_cache(cache_key, fetch, generation))
+            self._cache_fetches[fetch_key] = task
+            task.add_done_callback(lambda _: self._cache_fetches.pop(fetch_key, None))
+        # Shielded so one cancelled caller doesn't cancel the fetch other callers are waiting on
+        return await asyncio.shield(task)
+
+    async def _fetch_into_cache(self, cache_key: Tuple, fetch: Callable[[], Awaitable[Any]], generation: int) -> Any:
+        """Fetch a value and cache it, unless the cache was invalidated since the fetch was requested"""
+        value = await fetch()
+        if generation == self._cache_generation:
+            self._cache[cache_key] = value
+        return value
+
+    def _invalidate_cache(self) -> None:
+        """Drop cached reads after a write"""
+        self._cache_generation += 1
+        self._cache.clear()
+
+    async def connect(self) -> None:
+        """Create the shared Supabase client and its pooled transport before serving traffic"""
+        # Missing or bad settings only warn at startup (see Settings); the client is then
+        # created lazily by the first database call, which reports the error
         try:
-            self.client: Client = get_supabase_client()
-        except Exception as e:
-            import os
-            if os.getenv("TESTING", "false").lower() == "true":
-                self.client = None
-            else:
-                raise
+            await get_supabase_client()
+        except Exception:
+            logger.warning("Could not create the Supabase client at startup", exc_info=True)
+
+    async def aclose(self) -> None:
+        """Release cached reads and the pooled Supabase connections"""
+        self._invalidate_cache()
+        await close_supabase_clients()
 
     # Translation Keys CRUD operations
     
     async def get_translation_keys(self, category: Optional[str] = None) -> List[TranslationKey]:
         """Get all translation keys, optionally filtered by category"""
-        try:
-            query = self.client.table("translation_keys").select("*, translations(*)")
-            
+        # Not cached: this is the list editors refetch after saving, and a write only clears
+        # the cache of the worker that handled it
+        client = await get_supabase_client()
+        query = client.table("translation_keys").select("*, translations(*)")
+        
+        if category:
+            query = query.eq("category", category)
+        
+        response = await query.execute()
+        
+        return TRANSLATION_KEYS_ADAPTER.validate_python(
+            [_index_translations(item) for item in response.data]
+        )
+
+    async def iter_translation_keys(self, category: Optional[str] = None) -> AsyncIterator[List[TranslationKey]]:
+        """Yield translation keys page by page in key order, without holding the full list"""
+        client = await get_supabase_client()
+        last_key: Optional[str] = None
+        
+        while True:
+            query = client.table("translation_keys").select("*, translations(*)")
             if category:
                 query = query.eq("category", category)
-            
-            response = query.execute()
+            # Keyset pagination on the unique key stays stable while rows are inserted or deleted
+            if last_key is not None:
+                query = query.gt("key", last_key)
+            response = await query.order("key").limit(STREAM_PAGE_SIZE).execute()
             
             if response.data:
-                # Transform the translations array to a dict indexed by language_code
-                transformed_data = []
-                for item in response.data:
-                    translations_dict = {}
-                    if 'translations' in item and item['translations']:
-                        for translation in item['translations']:
-                            translations_dict[translation['language_code']] = {
-                                'value': translation['value'],
-                                'updated_at': translation['updated_at'],
-                                'updated_by': translation['updated_by']
-                            }
-                    
-                    transformed_item = {
-                        'id': item['id'],
-                        'key': item['key'],
-                        'category': item['category'],
-                        'description': item.get('description'),
-                        'created_at': item['created_at'],
-                        'updated_at': item['updated_at'],
-                        'translations': translations_dict
-                    }
-                    transformed_data.append(transformed_item)
-                
-                return [TranslationKey(**item) for item in transformed_data]
-            return []
-        except Exception as e:
-            raise Exception(f"Failed to fetch translation keys: {str(e)}")
+                yield TRANSLATION_KEYS_ADAPTER.validate_python(
+                    [_index_translations(item) for item in response.data]
+                )
+            if len(response.data) < STREAM_PAGE_SIZE:
+                return
+            last_key = response.data[-1]["key"]
+
+    async def get_localizations(self, locale: str) -> Dict[str, str]:
+        """Get a key -> value mapping of all translations for a single locale"""
+        return await self._cached(("localizations", locale), lambda: self._fetch_localizations(locale))
+
+    async def _fetch_localizations(self, locale: str) -> Dict[str, str]:
+        client = await get_supabase_client()
+        # Drive the join from translations so the language_code index filters rows
+        # and each result row is a single (key, value) pair
+        response = await client.table("translations").select(
+            "value, translation_keys!inner(key)"
+        ).eq("language_code", locale).execute()
+        
+        return {row["translation_keys"]["key"]: row["value"] for row in response.data}
 
     async def get_translation_key(self, key_id: UUID) -> Optional[TranslationKey]:
         """Get a single translation key by ID"""
-        try:
-            response = self.client.table("translation_keys").select(
-                "*, translations(*)"
-            ).eq("id", str(key_id)).execute()
-            
-            if response.data and len(response.data) > 0:
-                item = response.data[0]
-                # Transform the translations array to a dict indexed by language_code
-                translations_dict = {}
-                if 'translations' in item and item['translations']:
-                    for translation in item['translations']:
-                        translations_dict[translation['language_code']] = {
-                            'value': translation['value'],
-                            'updated_at': translation['updated_at'],
-                            'updated_by': translation['updated_by']
-                        }
-                
-                transformed_item = {
-                    'id': item['id'],
-                    'key': item['key'],
-                    'category': item['category'],
-                    'description': item.get('description'),
-                    'created_at': item['created_at'],
-                    'updated_at': item['updated_at'],
-                    'translations': translations_dict
-                }
-                
-                return TranslationKey(**transformed_item)
-            return None
-        except Exception as e:
-            raise Exception(f"Failed to fetch translation key: {str(e)}")
+        client = await get_supabase_client()
+        response = await client.table("translation_keys").select(
+            "*, translations(*)"
+        ).eq("id", str(key_id)).execute()
+        
+        if response.data:
+            return TranslationKey.model_validate(_index_translations(response.data[0]))
+        return None
+
+    async def get_existing_key_ids(self, key_ids: Set[UUID]) -> Set[UUID]:
+        """Get the subset of the given translation key IDs that exist, a chunk of IDs per query"""
+        if not key_ids:
+            return set()
+        
+        client = await get_supabase_client()
+        ids = [str(key_id) for key_id in key_ids]
+        responses = await asyncio.gather(*(
+            client.table("translation_keys").select("id").in_(
+                "id", ids[start:start + KEY_LOOKUP_CHUNK_SIZE]
+            ).execute()
+            for start in range(0, len(ids), KEY_LOOKUP_CHUNK_SIZE)
+        ))
+        
+        return {UUID(item["id"]) for response in responses for item in response.data}
 
     async def get_translation_key_by_key(self, key: str) -> Optional[TranslationKey]:
         """Get a single translation key by key string"""
-        try:
-            response = self.client.table("translation_keys").select(
-                "*, translations(*)"
-            ).eq("key", key).execute()
-            
-            if response.data and len(response.data) > 0:
-                item = response.data[0]
-                # Transform the translations array to a dict indexed by language_code
-                translations_dict = {}
-                if 'translations' in item and item['translations']:
-                    for translation in item['translations']:
-                        translations_dict[translation['language_code']] = {
-                            'value': translation['value'],
-                            'updated_at': translation['updated_at'],
-                            'updated_by': translation['updated_by']
-                        }
-                
-                transformed_item = {
-                    'id': item['id'],
-                    'key': item['key'],
-                    'category': item['category'],
-                    'description': item.get('description'),
-                    'created_at': item['created_at'],
-                    'updated_at': item['updated_at'],
-                    'translations': translations_dict
-                }
-                
-                return TranslationKey(**transformed_item)
-            return None
-        except Exception as e:
-            raise Exception(f"Failed to fetch translation key by key: {str(e)}")
+        client = await get_supabase_client()
+        response = await client.table("translation_keys").select(
+            "*, translations(*)"
+        ).eq("key", key).execute()
+        
+        if response.data:
+            return TranslationKey.model_validate(_index_translations(response.data[0]))
+        return None
+
+    async def get_translation_keys_by_keys(self, keys: List[str]) -> Dict[str, TranslationKey]:
+        """Get the translation keys matching the given key strings, indexed by key"""
+        unique_keys = list(dict.fromkeys(keys))
+        if not unique_keys:
+            return {}
+        
+        client = await get_supabase_client()
+        responses = await asyncio.gather(*(
+            client.table("translation_keys").select(
+                "id, key, category, description, created_at, updated_at"
+            ).in_("key", unique_keys[start:start + KEY_LOOKUP_CHUNK_SIZE]).execute()
+            for start in range(0, len(unique_keys), KEY_LOOKUP_CHUNK_SIZE)
+        ))
+        
+        rows = [item for response in responses for item in response.data]
+        return {translation_key.key: translation_key for translation_key in TRANSLATION_KEYS_ADAPTER.validate_python(rows)}
 
     async def create_translation_key(self, translation_key: TranslationKeyCreate) -> TranslationKey:
-        """Create a new translation key"""
+        """Create a new translation key, relying on the UNIQUE(key) constraint to reject duplicates"""
+        client = await get_supabase_client()
+        # Exclude initial_translations from the database insert since it's not a table column
+        insert_data = translation_key.model_dump(exclude={'initial_translations'})
+        
         try:
-            # Exclude initial_translations from the database insert since it's not a table column
-            insert_data = translation_key.model_dump(exclude={'initial_translations'})
-            
-            response = self.client.table("translation_keys").insert(
+            response = await client.table("translation_keys").insert(
                 insert_data
             ).execute()
-            
-            if response.data and len(response.data) > 0:
-                return TranslationKey(**response.data[0])
-            raise Exception("Failed to create translation key")
-        except Exception as e:
-            raise Exception(f"Failed to create translation key: {str(e)}")
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                raise TranslationKeyAlreadyExistsError("Translation key already exists")
+            raise
+        self._invalidate_cache()
+        
+        if response.data and len(response.data) > 0:
+            return TranslationKey.model_validate(response.data[0])
+        raise Exception("Failed to create translation key")
 
     async def update_translation_key(self, key_id: UUID, update_data: TranslationKeyUpdate) -> Optional[TranslationKey]:
         """Update an existing translation key"""
-        try:
-            # Only update fields that are not None
-            update_dict = {k: v for k, v in update_data.model_dump().items() if v is not None}
-            
-            response = self.client.table("translation_keys").update(
-                update_dict
-            ).eq("id", str(key_id)).execute()
-            
-            if response.data and len(response.data) > 0:
-                return TranslationKey(**response.data[0])
-            return None
-        except Exception as e:
-            raise Exception(f"Failed to update translation key: {str(e)}")
+        client = await get_supabase_client()
+        # Only update fields that are not None
+        update_dict = {k: v for k, v in update_data.model_dump().items() if v is not None}
+        
+        response = await client.table("translation_keys").update(
+            update_dict
+        ).eq("id", str(key_id)).execute()
+        self._invalidate_cache()
+        
+        if response.data and len(response.data) > 0:
+            return TranslationKey.model_validate(response.data[0])
+        return None
 
     async def delete_translation_key(self, key_id: UUID) -> bool:
-        """Delete a translation key and all its translations"""
-        try:
-            response = self.client.table("translation_keys").delete().eq(
-                "id", str(key_id)
-            ).execute()
-            return True
-        except Exception as e:
-            raise Exception(f"Failed to delete translation key: {str(e)}")
+        """Delete a translation key and all its translations, returning False if it doesn't exist"""
+        client = await get_supabase_client()
+        response = await client.table("translation_keys").delete().eq(
+            "id", str(key_id)
+        ).execute()
+        self._invalidate_cache()
+        # The deleted rows are returned, so an empty result means the key didn't exist
+        return len(response.data) > 0
 
     # Translations CRUD operations
 
     async def get_translations_for_key(self, key_id: UUID) -> List[Translation]:
         """Get all translations for a specific translation key"""
-        try:
-            response = self.client.table("translations").select("*").eq(
-                "translation_key_id", str(key_id)
-            ).execute()
-            
-            if response.data:
-                return [Translation(**item) for item in response.data]
-            return []
-        except Exception as e:
-            raise Exception(f"Failed to fetch translations: {str(e)}")
+        client = await get_supabase_client()
+        response = await client.table("translations").select("*").eq(
+            "translation_key_id", str(key_id)
+        ).execute()
+        
+        if response.data:
+            return TRANSLATIONS_ADAPTER.validate_python(response.data)
+        return []
 
     async def get_translation(self, key_id: UUID, language_code: str) -> Optional[Translation]:
         """Get a specific translation for a key and language"""
+        client = await get_supabase_client()
+        response = await client.table("translations").select("*").eq(
+            "translation_key_id", str(key_id)
+        ).eq("language_code", language_code).execute()
+        
+        if response.data and len(response.data) > 0:
+            return Translation.model_validate(response.data[0])
+        return None
+
+    async def upsert_translation(self, key_id: UUID, language_code: str, translation_data: TranslationCreate) -> Optional[Translation]:
+        """Create or update a translation for a specific key and language, returning None if the key doesn't exist"""
+        client = await get_supabase_client()
+        data = translation_data.model_dump()
+        data["translation_key_id"] = str(key_id)
+        data["language_code"] = language_code
+        
         try:
-            response = self.client.table("translations").select("*").eq(
-                "translation_key_id", str(key_id)
-            ).eq("language_code", language_code).execute()
-            
-            if response.data and len(response.data) > 0:
-                return Translation(**response.data[0])
-            return None
-        except Exception as e:
-            raise Exception(f"Failed to fetch translation: {str(e)}")
-
-    async def upsert_translation(self, key_id: UUID, language_code: str, translation_data: TranslationCreate) -> Translation:
-        """Create or update a translation for a specific key and language"""
-        try:
-            data = translation_data.model_dump()
-            data["translation_key_id"] = str(key_id)
-            data["language_code"] = language_code
-            
-            response = self.client.table("translations").upsert(
+            response = await client.table("translations").upsert(
                 data, on_conflict="translation_key_id,language_code"
             ).execute()
-            
-            if response.data and len(response.data) > 0:
-                return Translation(**response.data[0])
-            raise Exception("Failed to upsert translation")
-        except Exception as e:
-            raise Exception(f"Failed to upsert translation: {str(e)}")
-
-    async def bulk_update_translations(self, updates: List[BulkTranslationUpdate]) -> bool:
-        """Bulk update multiple translations"""
+        except APIError as e:
+            if e.code == FOREIGN_KEY_VIOLATION:
+                return None
+            raise
+        self._invalidate_cache()
+        
+        if response.data and len(response.data) > 0:
+            return Translation.model_validate(response.data[0])
+        raise Exception("Failed to upsert translation")
+
+    async def create_translation(self, key_id: UUID, language_code: str, translation_data: TranslationCreate) -> Optional[Translation]:
+        """Create a translation for a specific key and language, returning None if the key doesn't exist"""
+        client = await get_supabase_client()
+        data = translation_data.model_dump()
+        data["translation_key_id"] = str(key_id)
+        data["language_code"] = language_code
+        
         try:
-            # Convert updates to the format expected by Supabase
-            upsert_data = []
-            for update in updates:
-                upsert_data.append({
-                    "translation_key_id": str(update.translation_key_id),
-                    "language_code": update.language_code,
-                    "value": update.value,
-                    "updated_by": update.updated_by
-                })
-            
-            response = self.client.table("translations").upsert(
-                upsert_data, on_conflict="translation_key_id,language_code"
-            ).execute()
-            
-            return True
-        except Exception as e:
-            raise Exception(f"Failed to bulk update translations: {str(e)}")
+            response = await client.table("translations").insert(data).execute()
+        except APIError as e:
+            if e.code == FOREIGN_KEY_VIOLATION:
+                return None
+            if e.code == UNIQUE_VIOLATION:
+                raise TranslationAlreadyExistsError("Translation already exists for this language")
+            raise
+        self._invalidate_cache()
+        
+        if response.data and len(response.data) > 0:
+            return Translation.model_validate(response.data[0])
+        raise Exception("Failed to create translation")
+
+    async def bulk_update_translations(self, updates: List[BulkTranslationUpdate]) -> int:
+        """Bulk update multiple translations, returning how many rows were written"""
+        # Keep only the last update per key and language: fewer rows to send, and one
+        # INSERT ... ON CONFLICT cannot update the same row twice
+        unique_updates = list({
+            (update.translation_key_id, update.language_code): update for update in updates
+        }.values())
+        # Convert updates to the format expected by Supabase (UUIDs become strings in pydantic-core)
+        upsert_data = BULK_TRANSLATION_UPDATES_ADAPTER.dump_python(unique_updates, mode="json")
+        
+        try:
+            await self._upsert_chunked(
+                "translations", upsert_data, on_conflict="translation_key_id,language_code"
+            )
+        finally:
+            self._invalidate_cache()
+        
+        return len(unique_updates)
+
+    async def _upsert_chunked(self, table: str, rows: List[Dict[str, Any]], on_conflict: str) -> List[Dict[str, Any]]:
+        """Upsert rows as several bounded INSERT ... ON CONFLICT requests, a few at a time"""
+        client = await get_supabase_client()
+        semaphore = asyncio.Semaphore(BULK_UPSERT_CONCURRENCY)
+
+        async def upsert_chunk(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                response = await client.table(table).upsert(chunk, on_conflict=on_conflict).execute()
+                return response.data
+
+        tasks = [
+            asyncio.create_task(upsert_chunk(rows[start:start + BULK_UPSERT_CHUNK_SIZE]))
+            for start in range(0, len(rows), BULK_UPSERT_CHUNK_SIZE)
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            # Don't keep writing the remaining chunks after the failure has been reported
+            for task in tasks:
+                task.cancel()
+            raise
+        return [row for chunk_rows in results for row in chunk_rows]
+
+    async def import_translations(self, translation_keys: List[TranslationKeyCreate], translations: List[Tuple[str, str, str]], updated_by: str) -> None:
+        """Upsert translation keys and (key, language_code, value) translations in one round-trip"""
+        client = await get_supabase_client()
+        # Both tables are written by one set-based function (see import_translations in schema.sql)
+        try:
+            await client.rpc("import_translations", {
+                "keys": [
+                    translation_key.model_dump(exclude={'initial_translations'})
+                    for translation_key in translation_keys
+                ],
+                "translations": [
+                    {"key": key, "language_code": language_code, "value": value, "updated_by": updated_by}
+                    for key, language_code, value in translations
+                ]
+            }).execute()
+        finally:
+            self._invalidate_cache()
 
     # Utility methods
 
     async def get_categories(self) -> List[str]:
         """Get all unique categories"""
-        try:
-            response = self.client.table("translation_keys").select("category").execute()
-            
-            if response.data:
-                categories = list(set(item["category"] for item in response.data))
-                return sorted(categories)
-            return []
-        except Exception as e:
-            raise Exception(f"Failed to fetch categories: {str(e)}")
+        return await self._cached(("categories",), self._fetch_categories)
+
+    async def _fetch_categories(self) -> List[str]:
+        client = await get_supabase_client()
+        # DISTINCT and ORDER BY run in Postgres (see get_distinct_categories in schema.sql)
+        response = await client.rpc("get_distinct_categories").execute()
+        
+        return [item["category"] for item in response.data]
 
     async def search_translation_keys(self, search_term: str) -> List[TranslationKey]:
         """Search translation keys by key name or description"""
-        try:
-            response = self.client.table("translation_keys").select(
-                "*, translations(*)"
-            ).or_(
-                f"key.ilike.%{search_term}%,description.ilike.%{search_term}%"
-            ).execute()
-            
-            if response.data:
-                # Transform the translations array to a dict indexed by language_code
-                transformed_data = []
-                for item in response.data:
-                    translations_dict = {}
-                    if 'translations' in item and item['translations']:
-                        for translation in item['translations']:
-                            translations_dict[translation['language_code']] = {
-                                'value': translation['value'],
-                                'updated_at': translation['updated_at'],
-                                'updated_by': translation['updated_by']
-                            }
-                    
-                    transformed_item = {
-                        'id': item['id'],
-                        'key': item['key'],
-                        'category': item['category'],
-                        'description': item.get('description'),
-                        'created_at': item['created_at'],
-                        'updated_at': item['updated_at'],
-                        'translations': translations_dict
-                    }
-                    transformed_data.append(transformed_item)
-                
-                return [TranslationKey(**item) for item in transformed_data]
-            return []
-        except Exception as e:
-            raise Exception(f"Failed to search translation keys: {str(e)}")
-
-
-# Global database service instance
-db_service = DatabaseService() 
\ No newline at end of file
+        client = await get_supabase_client()
+        # search_term is passed as an RPC argument, never interpolated into the filter string
+        response = await client.rpc(
+            "search_keys", {"q": search_term}
+        ).select("*, translations(*)").execute()
+        
+        return TRANSLATION_KEYS_ADAPTER.validate_python(
+            [_index_translations(item) for item in response.data]
+        )
+ 
\ No newline at end of file
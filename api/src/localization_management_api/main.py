@@ -1,12 +1,22 @@
-from fastapi import FastAPI, HTTPException, Query
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional, Dict, Any
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from postgrest.exceptions import APIError
+from pydantic import ValidationError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
 from uuid import UUID
+import asyncio
 import csv
+import hashlib
 import io
+import itertools
+import logging
+import tempfile
 
 from .config import settings
-from .database import DatabaseService
+from .database import DatabaseService, TranslationAlreadyExistsError, TranslationKeyAlreadyExistsError
 from .models import (
     TranslationKey,
     Translation,
@@ -14,64 +24,154 @@ from .models import (
     TranslationKeyUpdate,
     TranslationCreate,
     BulkUpdateRequest,
-    BulkTranslationUpdate,
     CSVBulkImportRequest,
-    APIResponse
+    CSVRow,
+    APIResponse,
+    CSV_ROWS_ADAPTER,
+    TRANSLATION_KEYS_ADAPTER,
+    TRANSLATIONS_ADAPTER
 )
 
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One DatabaseService per worker, created at startup rather than at import time
+    app.state.db = DatabaseService()
+    # Build the client at startup so the first request doesn't pay for it (or race to create it)
+    if not settings.testing:
+        await app.state.db.connect()
+    yield
+    # Close pooled Supabase connections on shutdown
+    await app.state.db.aclose()
+
+
 app = FastAPI(
     title="Localization Management API",
     description="API for managing translation keys and their translations",
     version="1.0.0",
-    root_path="/api"
+    root_path="/api",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# Lazy initialization of database service
-_db_service = None
 
-def get_db_service():
-    global _db_service
-    if _db_service is None:
-        _db_service = DatabaseService()
-    return _db_service
+def get_db(request: Request) -> DatabaseService:
+    """Dependency returning the DatabaseService created in lifespan, or on first use"""
+    # Some hosts (e.g. the Vercel entry) never run lifespan, so the service is also built lazily
+    db_service = getattr(request.app.state, "db", None)
+    if db_service is None:
+        db_service = request.app.state.db = DatabaseService()
+    return db_service
+
+
+# Body of every 500, so database and library internals never reach clients
+INTERNAL_ERROR_DETAIL = "Internal server error"
+
+
+class UnhandledErrorMiddleware:
+    """Log unexpected failures and answer with a generic {"detail": ...} 500
+
+    Plain ASGI rather than @app.middleware("http"), so responses (including streamed ones)
+    pass straight through without a BaseHTTPMiddleware round trip
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        response_started = False
+        
+        async def send_tracking_start(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_tracking_start)
+        except Exception:
+            logger.exception("Unhandled error while processing %s %s", scope["method"], scope["path"])
+            # Once headers are sent there is no way to turn the response into a 500
+            if response_started:
+                raise
+            response = ORJSONResponse(status_code=500, content={"detail": INTERNAL_ERROR_DETAIL})
+            await response(scope, receive, send)
+
+
+# Added before CORSMiddleware so it runs inside it and 500s still carry CORS headers
+# (an exception_handler(Exception) would run in ServerErrorMiddleware, outside CORS)
+app.add_middleware(UnhandledErrorMiddleware)
 
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.allowed_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists let Starlette build preflight responses once instead of echoing request headers
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["authorization", "content-type"],
 )
 
 
+# PostgREST/Postgres error codes that map to client errors; anything else is a server error
+POSTGREST_ERROR_STATUS = {
+    "PGRST116": 404,  # no rows for a single-object request
+    "22P02": 400,  # invalid text representation
+    "23502": 400,  # not null violation
+    "23503": 409,  # foreign key violation
+    "23505": 409,  # unique violation
+    "42501": 403,  # insufficient privilege
+}
+
+
+@app.exception_handler(APIError)
+async def postgrest_error_handler(request: Request, exc: APIError) -> ORJSONResponse:
+    """Translate database errors into HTTP errors in one place"""
+    status_code = POSTGREST_ERROR_STATUS.get(exc.code)
+    if status_code is None:
+        # Unmapped codes are server errors; their message describes database internals
+        logger.error("Database error while processing %s %s", request.method, request.url.path, exc_info=exc)
+        return ORJSONResponse(status_code=500, content={"detail": INTERNAL_ERROR_DETAIL})
+    return ORJSONResponse(status_code=status_code, content={"detail": exc.message or str(exc)})
+
+
+# Read endpoints fetched on every page load may be reused briefly by browsers and revalidated by ETag
+HTTP_CACHE_CONTROL = "public, max-age=30, stale-while-revalidate=60"
+
+
+def _cacheable_response(request: Request, content: Any) -> Response:
+    """Render content with an ETag, answering 304 when the client already has this version"""
+    response = ORJSONResponse(content, headers={"Cache-Control": HTTP_CACHE_CONTROL})
+    # BLAKE2b is available on FIPS hosts where plain md5() is blocked, and hashes faster
+    etag = f'"{hashlib.blake2b(response.body, digest_size=16).hexdigest()}"'
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match == "*" or etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": HTTP_CACHE_CONTROL})
+    
+    response.headers["ETag"] = etag
+    return response
+
+
 # Enhanced original endpoint - now uses real database
-@app.get("/localizations/{project_id}/{locale}")
-async def get_localizations(project_id: str, locale: str) -> Dict[str, Any]:
+@app.get("/localizations/{project_id}/{locale}", response_model=Dict[str, Any])
+async def get_localizations(project_id: str, locale: str, request: Request, db_service: DatabaseService = Depends(get_db)) -> Response:
     """
     Get all localizations for a project and locale
     This is the original endpoint enhanced to use real database
     """
-    try:
-        # Get all translation keys
-        db_service = get_db_service()
-        translation_keys = await db_service.get_translation_keys()
-        
-        localizations = {}
-        for key in translation_keys:
-            # Find translation for the specified locale
-            for translation in key.translations:
-                if translation.language_code == locale:
-                    localizations[key.key] = translation.value
-                    break
-        
-        return {
-            "project_id": project_id,
-            "locale": locale,
-            "localizations": localizations
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to fetch localizations: {str(e)}")
+    localizations = await db_service.get_localizations(locale)
+    
+    return _cacheable_response(request, {
+        "project_id": project_id,
+        "locale": locale,
+        "localizations": localizations
+    })
 
 
 # Translation Keys endpoints
@@ -79,323 +179,356 @@ async def get_localizations(project_id: str, locale: str) -> Dict[str, Any]:
 @app.get("/translation-keys", response_model=List[TranslationKey])
 async def get_translation_keys(
     category: Optional[str] = Query(None, description="Filter by category"),
-    search: Optional[str] = Query(None, description="Search term for keys or descriptions")
-) -> List[TranslationKey]:
+    search: Optional[str] = Query(None, description="Search term for keys or descriptions"),
+    db_service: DatabaseService = Depends(get_db)
+) -> Response:
     """Get all translation keys with optional filtering"""
-    try:
-        db_service = get_db_service()
-        if search:
-            return await db_service.search_translation_keys(search)
-        else:
-            return await db_service.get_translation_keys(category)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to fetch translation keys: {str(e)}")
+    if search:
+        translation_keys = await db_service.search_translation_keys(search)
+    else:
+        translation_keys = await db_service.get_translation_keys(category)
+    # Serialize the whole list straight to JSON bytes in pydantic-core, bypassing jsonable_encoder
+    return Response(TRANSLATION_KEYS_ADAPTER.dump_json(translation_keys), media_type="application/json")
+
+
+@app.get("/translation-keys/stream")
+async def stream_translation_keys(
+    category: Optional[str] = Query(None, description="Filter by category"),
+    db_service: DatabaseService = Depends(get_db)
+) -> StreamingResponse:
+    """Stream all translation keys as newline-delimited JSON, one key per line"""
+    async def ndjson_lines():
+        async for page in db_service.iter_translation_keys(category):
+            yield b"".join(translation_key.model_dump_json().encode() + b"\n" for translation_key in page)
+    
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
 
 
 # Bulk operations
 
 @app.put("/translation-keys/bulk", response_model=APIResponse)
-async def bulk_update_translations(bulk_request: BulkUpdateRequest) -> APIResponse:
+async def bulk_update_translations(bulk_request: BulkUpdateRequest, db_service: DatabaseService = Depends(get_db)) -> APIResponse:
     """
     Bulk update multiple translations at once
     This is useful for updating many translations simultaneously from the UI
     """
+    if not bulk_request.updates:
+        raise HTTPException(status_code=400, detail="No updates provided")
+    
+    # Validate that all translation keys exist
+    unique_key_ids = set(update.translation_key_id for update in bulk_request.updates)
+    
+    missing_key_ids = unique_key_ids - await db_service.get_existing_key_ids(unique_key_ids)
+    if missing_key_ids:
+        raise HTTPException(
+            status_code=404, 
+            detail=f"Translation keys with IDs {', '.join(sorted(map(str, missing_key_ids)))} not found"
+        )
+    
+    # Perform bulk update
+    updated_count = await db_service.bulk_update_translations(bulk_request.updates)
+    
+    return APIResponse(
+        success=True, 
+        message=f"Successfully updated {updated_count} translations",
+        data={"updated_count": updated_count}
+    )
+
+
+# CSV imports are parsed and written this many rows at a time so memory stays bounded
+CSV_IMPORT_BATCH_SIZE = 500
+
+# Translation columns read from each CSV row
+CSV_LANGUAGE_COLUMNS = ('en', 'es', 'pt')
+
+# Streamed CSV bodies are held in memory up to this size, then spooled to disk
+CSV_SPOOL_MAX_SIZE = 1024 * 1024
+
+# Strict-mode rejections list at most this many errors, plus the total count
+CSV_MAX_REPORTED_ERRORS = 100
+
+
+def _validate_csv_batch(batch: List[Dict[str, str]], first_row_num: int) -> Tuple[List[CSVRow], List[Dict[str, Any]]]:
+    """Validate a batch of CSV rows, returning the valid rows and a report of every invalid one"""
     try:
-        if not bulk_request.updates:
-            raise HTTPException(status_code=400, detail="No updates provided")
+        return CSV_ROWS_ADAPTER.validate_python(batch), []
+    except ValidationError as e:
+        errors = [
+            {"row": first_row_num + error["loc"][0], "field": ".".join(map(str, error["loc"][1:])), "message": error["msg"]}
+            for error in e.errors()
+        ]
+    
+    invalid_rows = {error["row"] for error in errors}
+    valid_rows = [
+        CSVRow.model_validate(row)
+        for row_num, row in enumerate(batch, start=first_row_num)
+        if row_num not in invalid_rows
+    ]
+    return valid_rows, errors
+
+
+async def _read_csv_batches(reader: csv.DictReader) -> AsyncIterator[List[Dict[str, str]]]:
+    """Yield raw CSV rows a batch at a time, parsed on a worker thread so large payloads don't block the event loop"""
+    while True:
+        batch = await asyncio.to_thread(list, itertools.islice(reader, CSV_IMPORT_BATCH_SIZE))
+        if not batch:
+            return
+        yield batch
+
+
+async def _find_csv_errors(reader: csv.DictReader) -> Tuple[List[Dict[str, Any]], int]:
+    """Validate every row without writing anything, returning the first errors and how many there are in total"""
+    errors: List[Dict[str, Any]] = []
+    error_count = 0
+    row_num = 1  # Row 1 is the header
+    async for batch in _read_csv_batches(reader):
+        batch_errors = _validate_csv_batch(batch, row_num + 1)[1]
+        error_count += len(batch_errors)
+        errors.extend(batch_errors[:CSV_MAX_REPORTED_ERRORS - len(errors)])
+        row_num += len(batch)
+    return errors, error_count
+
+
+async def _import_csv_rows(open_reader: Callable[[], csv.DictReader], updated_by: str, strict: bool, db_service: DatabaseService) -> Union[APIResponse, ORJSONResponse]:
+    """Import rows from a CSV reader batch by batch through the bulk upsert paths"""
+    # In strict mode every row is checked before the first write, so a rejection means nothing was imported
+    if strict:
+        errors, error_count = await _find_csv_errors(open_reader())
+        if errors:
+            detail = "; ".join(f"Row {error['row']}: {error['field']}: {error['message']}" for error in errors)
+            if error_count > len(errors):
+                detail += f"; and {error_count - len(errors)} more"
+            return ORJSONResponse(status_code=400, content={
+                "detail": detail,
+                "errors": errors,
+                "error_count": error_count
+            })
+    
+    created_keys = 0
+    updated_keys = 0
+    translations_updated = 0
+    skipped_rows: List[Dict[str, Any]] = []
+    row_num = 1  # Row 1 is the header
+    
+    async for batch in _read_csv_batches(open_reader()):
+        csv_batch, errors = _validate_csv_batch(batch, row_num + 1)
+        row_num += len(batch)
+        skipped_rows.extend(errors)
         
-        # Validate that all translation keys exist
-        unique_key_ids = set(update.translation_key_id for update in bulk_request.updates)
+        # Collect the final state of each key and translation (the last row wins)
+        csv_keys: Dict[str, TranslationKeyCreate] = {}
+        csv_translations: Dict[Tuple[str, str], str] = {}
         
-        db_service = get_db_service()
-        for key_id in unique_key_ids:
-            translation_key = await db_service.get_translation_key(key_id)
-            if not translation_key:
-                raise HTTPException(
-                    status_code=404, 
-                    detail=f"Translation key with ID {key_id} not found"
-                )
+        for row in csv_batch:
+            csv_keys[row.key] = TranslationKeyCreate(
+                key=row.key,
+                category=row.category,
+                description=row.description or None
+            )
+            
+            # Collect translations for en, es, pt
+            for lang_code in CSV_LANGUAGE_COLUMNS:
+                value = getattr(row, lang_code)
+                if value:  # Only add non-empty translations
+                    csv_translations[row.key, lang_code] = value
         
-        # Perform bulk update
-        success = await db_service.bulk_update_translations(bulk_request.updates)
+        # Look up every key named in the batch in one pass instead of once per row
+        existing_keys = await db_service.get_translation_keys_by_keys(list(csv_keys))
         
-        if success:
-            return APIResponse(
-                success=True, 
-                message=f"Successfully updated {len(bulk_request.updates)} translations",
-                data={"updated_count": len(bulk_request.updates)}
+        # Only write keys that are new or whose category/description changed (a blank description keeps the old one)
+        changed_keys = [
+            translation_key for key, translation_key in csv_keys.items()
+            if key not in existing_keys
+            or existing_keys[key].category != translation_key.category
+            or translation_key.description not in (None, existing_keys[key].description)
+        ]
+        batch_created = sum(1 for translation_key in changed_keys if translation_key.key not in existing_keys)
+        created_keys += batch_created
+        updated_keys += len(changed_keys) - batch_created
+        
+        # Write the batch's keys and translations in one set-based statement
+        if changed_keys or csv_translations:
+            await db_service.import_translations(
+                changed_keys,
+                [(key, lang_code, value) for (key, lang_code), value in csv_translations.items()],
+                updated_by
             )
-        else:
-            raise HTTPException(status_code=500, detail="Failed to perform bulk update")
-            
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to bulk update translations: {str(e)}")
+        translations_updated += len(csv_translations)
+    
+    return APIResponse(
+        success=True,
+        message=f"CSV import completed successfully",
+        data={
+            "created_keys": created_keys,
+            "updated_keys": updated_keys,
+            "translations_updated": translations_updated,
+            "total_rows_processed": created_keys + updated_keys,
+            "skipped_rows": skipped_rows
+        }
+    )
 
 
 @app.post("/translation-keys/bulk/csv", response_model=APIResponse)
-async def bulk_import_from_csv(csv_request: CSVBulkImportRequest) -> APIResponse:
+async def bulk_import_from_csv(
+    csv_request: CSVBulkImportRequest,
+    strict: bool = Query(True, description="Reject the import on invalid rows instead of skipping them"),
+    db_service: DatabaseService = Depends(get_db)
+) -> Union[APIResponse, ORJSONResponse]:
     """
     Bulk import translation keys and translations from CSV data
     Expected CSV format: key,category,description,en,es,pt
     """
-    try:
-        # Parse CSV data
-        csv_reader = csv.DictReader(io.StringIO(csv_request.csv_data))
-        
-        db_service = get_db_service()
-        created_keys = 0
-        updated_keys = 0
-        translation_updates = []
-        
-        for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 since row 1 is header
-            try:
-                # Validate required fields
-                if not row.get('key') or not row.get('category'):
-                    raise HTTPException(
-                        status_code=400, 
-                        detail=f"Row {row_num}: 'key' and 'category' are required fields"
-                    )
-                
-                key = row['key'].strip()
-                category = row['category'].strip()
-                description = row.get('description', '').strip() or None
-                
-                # Check if translation key exists
-                existing_key = await db_service.get_translation_key_by_key(key)
-                
-                if not existing_key:
-                    # Create new translation key
-                    new_key = TranslationKeyCreate(
-                        key=key,
-                        category=category,
-                        description=description
-                    )
-                    created_key = await db_service.create_translation_key(new_key)
-                    key_id = created_key.id
-                    created_keys += 1
-                else:
-                    # Update existing key if category or description changed
-                    if existing_key.category != category or existing_key.description != description:
-                        update_data = TranslationKeyUpdate(
-                            category=category,
-                            description=description
-                        )
-                        await db_service.update_translation_key(existing_key.id, update_data)
-                        updated_keys += 1
-                    key_id = existing_key.id
-                
-                # Prepare translation updates for en, es, pt
-                for lang_code in ['en', 'es', 'pt']:
-                    value = row.get(lang_code, '').strip()
-                    if value:  # Only add non-empty translations
-                        translation_updates.append(
-                            BulkTranslationUpdate(
-                                translation_key_id=key_id,
-                                language_code=lang_code,
-                                value=value,
-                                updated_by=csv_request.updated_by
-                            )
-                        )
-                        
-            except Exception as e:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Error processing row {row_num}: {str(e)}"
-                )
-        
-        # Perform bulk translation updates
-        translation_success = True
-        if translation_updates:
-            translation_success = await db_service.bulk_update_translations(translation_updates)
+    return await _import_csv_rows(
+        lambda: csv.DictReader(io.StringIO(csv_request.csv_data)),
+        csv_request.updated_by,
+        strict,
+        db_service
+    )
+
+
+@app.post("/translation-keys/bulk/csv/stream", response_model=APIResponse)
+async def bulk_import_from_csv_stream(
+    request: Request,
+    updated_by: str = Query(..., description="User recorded on the imported translations"),
+    strict: bool = Query(True, description="Reject the import on invalid rows instead of skipping them"),
+    db_service: DatabaseService = Depends(get_db)
+) -> Union[APIResponse, ORJSONResponse]:
+    """
+    Bulk import translation keys and translations from a raw text/csv request body
+    The body is spooled as it arrives instead of being loaded into a JSON string
+    Expected CSV format: key,category,description,en,es,pt
+    """
+    with tempfile.SpooledTemporaryFile(max_size=CSV_SPOOL_MAX_SIZE) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
         
-        if not translation_success:
-            raise HTTPException(status_code=500, detail="Failed to update translations")
+        csv_text = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
         
-        return APIResponse(
-            success=True,
-            message=f"CSV import completed successfully",
-            data={
-                "created_keys": created_keys,
-                "updated_keys": updated_keys,
-                "translations_updated": len(translation_updates),
-                "total_rows_processed": created_keys + updated_keys
-            }
-        )
+        def open_reader() -> csv.DictReader:
+            # Strict imports read the spooled body twice: once to validate, once to write
+            csv_text.seek(0)
+            return csv.DictReader(csv_text)
         
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to import CSV: {str(e)}")
+        try:
+            return await _import_csv_rows(open_reader, updated_by, strict, db_service)
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
 
 
 @app.get("/translation-keys/{key_id}", response_model=TranslationKey)
-async def get_translation_key(key_id: UUID) -> TranslationKey:
+async def get_translation_key(key_id: UUID, db_service: DatabaseService = Depends(get_db)) -> Response:
     """Get a single translation key by ID"""
-    try:
-        db_service = get_db_service()
-        translation_key = await db_service.get_translation_key(key_id)
-        if not translation_key:
-            raise HTTPException(status_code=404, detail="Translation key not found")
-        return translation_key
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to fetch translation key: {str(e)}")
+    translation_key = await db_service.get_translation_key(key_id)
+    if not translation_key:
+        raise HTTPException(status_code=404, detail="Translation key not found")
+    return Response(translation_key.model_dump_json(), media_type="application/json")
 
 
 @app.post("/translation-keys", response_model=TranslationKey)
-async def create_translation_key(translation_key: TranslationKeyCreate) -> TranslationKey:
+async def create_translation_key(translation_key: TranslationKeyCreate, db_service: DatabaseService = Depends(get_db)) -> TranslationKey:
     """Create a new translation key"""
+    # Create the translation key; a duplicate is rejected by the insert itself
     try:
-        db_service = get_db_service()
-        # Check if key already exists
-        existing_key = await db_service.get_translation_key_by_key(translation_key.key)
-        if existing_key:
-            raise HTTPException(status_code=400, detail="Translation key already exists")
-        
-        # Create the translation key
         created_key = await db_service.create_translation_key(translation_key)
-        
-        # Create initial translations if provided
-        if translation_key.initial_translations:
-            for locale, value in translation_key.initial_translations.items():
-                if locale and value is not None:  # Allow empty strings
-                    translation_data = TranslationCreate(
-                        language_code=locale,
-                        value=value,
-                        updated_by="system"
-                    )
-                    await db_service.upsert_translation(created_key.id, locale, translation_data)
-        
-        # Return the created key with its translations
-        return await db_service.get_translation_key(created_key.id)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to create translation key: {str(e)}")
+    except TranslationKeyAlreadyExistsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Create initial translations if provided, concurrently since each locale is independent
+    created_translations = []
+    if translation_key.initial_translations:
+        created_translations = await asyncio.gather(*(
+            db_service.upsert_translation(
+                created_key.id,
+                locale,
+                TranslationCreate(language_code=locale, value=value, updated_by="system")
+            )
+            for locale, value in translation_key.initial_translations.items()
+            if locale and value is not None  # Allow empty strings
+        ))
+    
+    # Return the created key with its translations, built from the write results rather than refetched
+    return created_key.model_copy(update={"translations": {
+        translation.language_code: {
+            "value": translation.value,
+            "updated_at": translation.updated_at.isoformat(),
+            "updated_by": translation.updated_by
+        }
+        for translation in created_translations
+        if translation
+    }})
 
 
 @app.put("/translation-keys/{key_id}", response_model=TranslationKey)
-async def update_translation_key(key_id: UUID, update_data: TranslationKeyUpdate) -> TranslationKey:
+async def update_translation_key(key_id: UUID, update_data: TranslationKeyUpdate, db_service: DatabaseService = Depends(get_db)) -> TranslationKey:
     """Update an existing translation key"""
-    try:
-        db_service = get_db_service()
-        translation_key = await db_service.update_translation_key(key_id, update_data)
-        if not translation_key:
-            raise HTTPException(status_code=404, detail="Translation key not found")
-        return translation_key
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to update translation key: {str(e)}")
+    translation_key = await db_service.update_translation_key(key_id, update_data)
+    if not translation_key:
+        raise HTTPException(status_code=404, detail="Translation key not found")
+    return translation_key
 
 
 @app.delete("/translation-keys/{key_id}", response_model=APIResponse)
-async def delete_translation_key(key_id: UUID) -> APIResponse:
+async def delete_translation_key(key_id: UUID, db_service: DatabaseService = Depends(get_db)) -> APIResponse:
     """Delete a translation key and all its translations"""
-    try:
-        db_service = get_db_service()
-        # Check if key exists first
-        existing_key = await db_service.get_translation_key(key_id)
-        if not existing_key:
-            raise HTTPException(status_code=404, detail="Translation key not found")
-        
-        success = await db_service.delete_translation_key(key_id)
-        if success:
-            return APIResponse(success=True, message="Translation key deleted successfully")
-        else:
-            raise HTTPException(status_code=500, detail="Failed to delete translation key")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to delete translation key: {str(e)}")
+    success = await db_service.delete_translation_key(key_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Translation key not found")
+    return APIResponse(success=True, message="Translation key deleted successfully")
 
 
 # Translations endpoints
 
 @app.get("/translation-keys/{key_id}/translations", response_model=List[Translation])
-async def get_translations_for_key(key_id: UUID) -> List[Translation]:
+async def get_translations_for_key(key_id: UUID, db_service: DatabaseService = Depends(get_db)) -> Response:
     """Get all translations for a specific translation key"""
-    try:
-        db_service = get_db_service()
-        # Check if key exists
-        translation_key = await db_service.get_translation_key(key_id)
-        if not translation_key:
-            raise HTTPException(status_code=404, detail="Translation key not found")
-        
-        return await db_service.get_translations_for_key(key_id)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to fetch translations: {str(e)}")
+    # The existence check and the fetch are independent, so run them concurrently
+    translation_key, translations = await asyncio.gather(
+        db_service.get_translation_key(key_id),
+        db_service.get_translations_for_key(key_id)
+    )
+    if not translation_key:
+        raise HTTPException(status_code=404, detail="Translation key not found")
+    
+    return Response(TRANSLATIONS_ADAPTER.dump_json(translations), media_type="application/json")
 
 
 @app.get("/translation-keys/{key_id}/translations/{locale}", response_model=Translation)
-async def get_translation(key_id: UUID, locale: str) -> Translation:
+async def get_translation(key_id: UUID, locale: str, db_service: DatabaseService = Depends(get_db)) -> Translation:
     """Get a specific translation for a key and language"""
-    try:
-        db_service = get_db_service()
-        translation = await db_service.get_translation(key_id, locale)
-        if not translation:
-            raise HTTPException(status_code=404, detail="Translation not found")
-        return translation
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to fetch translation: {str(e)}")
+    translation = await db_service.get_translation(key_id, locale)
+    if not translation:
+        raise HTTPException(status_code=404, detail="Translation not found")
+    return translation
 
 
 @app.put("/translation-keys/{key_id}/translations/{locale}", response_model=Translation)
-async def upsert_translation(key_id: UUID, locale: str, translation_data: TranslationCreate) -> Translation:
+async def upsert_translation(key_id: UUID, locale: str, translation_data: TranslationCreate, db_service: DatabaseService = Depends(get_db)) -> Translation:
     """Create or update a translation for a specific key and language"""
-    try:
-        db_service = get_db_service()
-        # Check if key exists
-        translation_key = await db_service.get_translation_key(key_id)
-        if not translation_key:
-            raise HTTPException(status_code=404, detail="Translation key not found")
-        
-        return await db_service.upsert_translation(key_id, locale, translation_data)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to upsert translation: {str(e)}")
+    translation = await db_service.upsert_translation(key_id, locale, translation_data)
+    if not translation:
+        raise HTTPException(status_code=404, detail="Translation key not found")
+    return translation
 
 
 @app.post("/translation-keys/{key_id}/translations/{locale}", response_model=Translation)
-async def create_translation(key_id: UUID, locale: str, translation_data: TranslationCreate) -> Translation:
+async def create_translation(key_id: UUID, locale: str, translation_data: TranslationCreate, db_service: DatabaseService = Depends(get_db)) -> Translation:
     """Create a new translation for a specific key and language"""
     try:
-        db_service = get_db_service()
-        # Check if key exists
-        translation_key = await db_service.get_translation_key(key_id)
-        if not translation_key:
-            raise HTTPException(status_code=404, detail="Translation key not found")
-        
-        # Check if translation already exists
-        existing_translation = await db_service.get_translation(key_id, locale)
-        if existing_translation:
-            raise HTTPException(status_code=400, detail="Translation already exists for this language")
-        
-        return await db_service.upsert_translation(key_id, locale, translation_data)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to create translation: {str(e)}")
+        translation = await db_service.create_translation(key_id, locale, translation_data)
+    except TranslationAlreadyExistsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not translation:
+        raise HTTPException(status_code=404, detail="Translation key not found")
+    return translation
 
 
 # Utility endpoints
 
 @app.get("/categories", response_model=List[str])
-async def get_categories() -> List[str]:
+async def get_categories(request: Request, db_service: DatabaseService = Depends(get_db)) -> Response:
     """Get all unique categories"""
-    try:
-        db_service = get_db_service()
-        return await db_service.get_categories()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to fetch categories: {str(e)}")
+    return _cacheable_response(request, await db_service.get_categories())
 
 
 @app.get("/health")
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional, List, Dict
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
 from uuid import UUID
 
 
@@ -39,7 +39,7 @@ class Translation(TranslationBase):
     translation_key_id: UUID
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
 
 
 class TranslationKey(TranslationKeyBase):
@@ -48,7 +48,12 @@ class TranslationKey(TranslationKeyBase):
     updated_at: datetime
     translations: Dict[str, Dict[str, str]] = {}
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
+
+
+# Validate/serialize whole lists in one pydantic-core call instead of one model per row
+TRANSLATION_KEYS_ADAPTER = TypeAdapter(List[TranslationKey])
+TRANSLATIONS_ADAPTER = TypeAdapter(List[Translation])
 
 
 class BulkTranslationUpdate(BaseModel):
@@ -62,14 +67,23 @@ class BulkUpdateRequest(BaseModel):
     updates: List[BulkTranslationUpdate]
 
 
+BULK_TRANSLATION_UPDATES_ADAPTER = TypeAdapter(List[BulkTranslationUpdate])
+
+
 class CSVRow(BaseModel):
-    key: str = Field(..., description="Translation key identifier")
-    category: str = Field(..., description="Category for the translation key")
+    key: str = Field(..., min_length=1, description="Translation key identifier")
+    category: str = Field(..., min_length=1, description="Category for the translation key")
     description: Optional[str] = Field(None, description="Optional description")
     en: Optional[str] = Field(None, description="English translation")
     es: Optional[str] = Field(None, description="Spanish translation")
     pt: Optional[str] = Field(None, description="Portuguese translation")
 
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+
+# Validate a whole batch of parsed CSV rows in one pydantic-core call
+CSV_ROWS_ADAPTER = TypeAdapter(List[CSVRow])
+
 
 class CSVBulkImportRequest(BaseModel):
     csv_data: str = Field(..., description="CSV content as string")
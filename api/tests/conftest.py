@@ -1,16 +1,21 @@
+import itertools
 import os
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
 import pytest
 import pytest_asyncio
-import asyncio
-from typing import AsyncGenerator, List, Dict, Optional, Any
-from httpx import AsyncClient
-from uuid import uuid4, UUID
-from unittest.mock import AsyncMock, MagicMock
+from typing import AsyncGenerator, AsyncIterator, Iterator, List, Dict, Optional, Any, Set, Tuple, Union
+from httpx import ASGITransport, AsyncClient
+from postgrest.exceptions import APIError
+from uuid import UUID
 
 # Set TESTING environment variable as early as possible
 os.environ["TESTING"] = "true"
 
-from src.localization_management_api.main import app
+from src.localization_management_api.main import app, get_db
+from src.localization_management_api.database import TranslationAlreadyExistsError, TranslationKeyAlreadyExistsError
 from src.localization_management_api.models import (
     TranslationKeyCreate, 
     TranslationCreate, 
@@ -21,263 +26,375 @@ from src.localization_management_api.models import (
 )
 
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+def pytest_asyncio_loop_factories(config, item):
+    """Run async tests and fixtures on uvloop where it is available (it has no Windows build)"""
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return {"uvloop": uvloop.new_event_loop}
+
+
+# Fixed timestamp for mock rows, typed as the models store it so they can skip validation
+_MOCK_TIMESTAMP = datetime(2023, 1, 1, tzinfo=timezone.utc)
+_MOCK_TIMESTAMP_ISO = "2023-01-01T00:00:00Z"
+
+
+# Deterministic source of unique IDs and key suffixes, so fixtures don't draw on the OS CSPRNG
+_sequence = itertools.count(1)
+
+
+def _next_uuid() -> UUID:
+    """Return a new unique UUID"""
+    return UUID(int=next(_sequence))
+
+
+def _as_uuid(key_id: Union[UUID, str]) -> UUID:
+    """Normalize a key ID once at the mock's boundary; stores are keyed by UUID"""
+    return key_id if isinstance(key_id, UUID) else UUID(key_id)
+
+
+def _next_suffix() -> str:
+    """Return a new unique 8-character suffix for sample keys"""
+    return f"{next(_sequence):08x}"
+
+
+@dataclass(slots=True)
+class _StoredKey:
+    """Compact in-memory row mirroring the TranslationKey fields, minus translations"""
+    id: UUID
+    key: str
+    category: str
+    description: Optional[str]
+    created_at: datetime
+    updated_at: datetime
 
 
 # Mock database service for all tests
 class MockDatabaseService:
     def __init__(self):
-        self.translation_keys: Dict[str, TranslationKey] = {}
-        self.translations: Dict[str, Dict[str, Translation]] = {}
+        # Keys are kept as slotted rows and only turned into TranslationKey models when returned
+        self.translation_keys: Dict[UUID, _StoredKey] = {}
+        # Translations are stored write-through in both shapes reads need, so reads don't rebuild them
+        self.translations: Dict[UUID, Dict[str, Translation]] = {}
+        self._translation_values: Dict[UUID, Dict[str, Dict[str, str]]] = {}
+        # Secondary index from key string to key ID, so lookups by key are O(1)
+        self._key_index: Dict[str, UUID] = {}
+        # Lowercased (key, category, description) per key ID, computed on write for searches
+        self._search_index: Dict[UUID, Tuple[str, str, str]] = {}
+        # Inverted index from category to key IDs, for category filters and the category list
+        self._by_category: Dict[str, Set[UUID]] = defaultdict(set)
+        # Sorted category list, rebuilt lazily only after a category appears or disappears
+        self._categories_sorted: Optional[List[str]] = None
+    
+    def reset(self) -> None:
+        """Drop all stored keys and translations"""
+        self.translation_keys.clear()
+        self.translations.clear()
+        self._translation_values.clear()
+        self._key_index.clear()
+        self._search_index.clear()
+        self._by_category.clear()
+        self._categories_sorted = None
+    
+    @staticmethod
+    def _as_model(key: _StoredKey, translations: Optional[Dict[str, Dict[str, str]]] = None) -> TranslationKey:
+        """Build the TranslationKey handed back to callers from a stored row"""
+        return TranslationKey.model_construct(**asdict(key), translations=translations or {})
+    
+    def _with_translations(self, key: _StoredKey) -> TranslationKey:
+        """Attach the key's current translations in the dict format expected by TranslationKey"""
+        return self._as_model(key, dict(self._translation_values.get(key.id, {})))
+    
+    def _index_for_search(self, key: _StoredKey) -> None:
+        """Record the lowercased searchable fields of a key"""
+        self._search_index[key.id] = (key.key.lower(), key.category.lower(), (key.description or "").lower())
+    
+    def _remove_from_category(self, category: str, key_id: UUID) -> None:
+        """Drop a key ID from its category, forgetting categories that become empty"""
+        self._by_category[category].discard(key_id)
+        if not self._by_category[category]:
+            del self._by_category[category]
+            self._categories_sorted = None
+    
+    def _add_to_category(self, category: str, key_id: UUID) -> None:
+        """Add a key ID to its category, noting when the category is new"""
+        if category not in self._by_category:
+            self._categories_sorted = None
+        self._by_category[category].add(key_id)
+    
+    def _store_translation(self, key_id: UUID, language_code: str, value: str, updated_by: str) -> Translation:
+        """Save a translation in both stored shapes"""
+        # The mock builds these from known-good values, so skip pydantic validation
+        translation = Translation.model_construct(
+            id=_next_uuid(),
+            translation_key_id=key_id,
+            language_code=language_code,
+            value=value,
+            updated_at=_MOCK_TIMESTAMP,
+            updated_by=updated_by
+        )
+        self.translations.setdefault(key_id, {})[language_code] = translation
+        self._translation_values.setdefault(key_id, {})[language_code] = {
+            "value": value,
+            "updated_at": _MOCK_TIMESTAMP_ISO,
+            "updated_by": updated_by
+        }
+        return translation
     
     async def create_translation_key(self, key_data: TranslationKeyCreate) -> TranslationKey:
         """Mock creating a translation key"""
         # Check for duplicates
-        for existing_key in self.translation_keys.values():
-            if existing_key.key == key_data.key:
-                raise Exception(f"Translation key '{key_data.key}' already exists")
+        if key_data.key in self._key_index:
+            raise TranslationKeyAlreadyExistsError("Translation key already exists")
         
-        key_id = str(uuid4())
-        translation_key = TranslationKey(
+        key_id = _next_uuid()
+        stored_key = _StoredKey(
             id=key_id,
             key=key_data.key,
             category=key_data.category,
             description=key_data.description,
-            created_at="2023-01-01T00:00:00Z",
-            updated_at="2023-01-01T00:00:00Z",
-            translations={}
+            created_at=_MOCK_TIMESTAMP,
+            updated_at=_MOCK_TIMESTAMP
         )
-        self.translation_keys[key_id] = translation_key
-        self.translations[key_id] = {}
-        return translation_key
+        self.translation_keys[key_id] = stored_key
+        self._key_index[key_data.key] = key_id
+        self._add_to_category(stored_key.category, key_id)
+        self._index_for_search(stored_key)
+        return self._as_model(stored_key)
     
     async def get_translation_key(self, key_id: UUID) -> Optional[TranslationKey]:
         """Mock getting a translation key by ID"""
-        key_str = str(key_id)
-        if key_str in self.translation_keys:
-            key = self.translation_keys[key_str]
-            # Add current translations - convert to dict format expected by TranslationKey
-            key.translations = {
-                lang: {
-                    "value": translation["value"],
-                    "updated_at": translation["updated_at"],
-                    "updated_by": translation["updated_by"]
-                }
-                for lang, translation in self.translations.get(key_str, {}).items()
-            }
-            return key
-        return None
+        key = self.translation_keys.get(_as_uuid(key_id))
+        return self._with_translations(key) if key else None
+    
+    async def get_existing_key_ids(self, key_ids: Set[UUID]) -> Set[UUID]:
+        """Mock getting the subset of key IDs that exist"""
+        return {key_id for key_id in key_ids if _as_uuid(key_id) in self.translation_keys}
+    
+    async def get_translation_keys_by_keys(self, keys: List[str]) -> Dict[str, TranslationKey]:
+        """Mock getting translation keys by key strings"""
+        return {
+            key: self._as_model(self.translation_keys[self._key_index[key]])
+            for key in keys
+            if key in self._key_index
+        }
     
     async def get_translation_key_by_key(self, key: str) -> Optional[TranslationKey]:
         """Mock getting a translation key by key string"""
-        for translation_key in self.translation_keys.values():
-            if translation_key.key == key:
-                # Add current translations - convert to dict format expected by TranslationKey
-                translation_key.translations = {
-                    lang: {
-                        "value": translation["value"],
-                        "updated_at": translation["updated_at"],
-                        "updated_by": translation["updated_by"]
-                    }
-                    for lang, translation in self.translations.get(translation_key.id, {}).items()
-                }
-                return translation_key
-        return None
+        key_id = self._key_index.get(key)
+        return self._with_translations(self.translation_keys[key_id]) if key_id else None
     
     async def get_translation_keys(self, category: Optional[str] = None) -> List[TranslationKey]:
         """Mock getting all translation keys"""
-        keys = list(self.translation_keys.values())
         if category:
-            keys = [key for key in keys if key.category == category]
+            keys = [self.translation_keys[key_id] for key_id in self._by_category.get(category, ())]
+        else:
+            keys = list(self.translation_keys.values())
         
-        # Add translations to each key - convert to dict format expected by TranslationKey
-        for key in keys:
-            key.translations = {
-                lang: {
-                    "value": translation["value"],
-                    "updated_at": translation["updated_at"],
-                    "updated_by": translation["updated_by"]
-                }
-                for lang, translation in self.translations.get(key.id, {}).items()
-            }
-        return keys
+        return [self._with_translations(key) for key in keys]
+    
+    async def iter_translation_keys(self, category: Optional[str] = None) -> AsyncIterator[List[TranslationKey]]:
+        """Mock streaming translation keys in pages of two, ordered by key"""
+        keys = sorted(await self.get_translation_keys(category), key=lambda key: key.key)
+        for start in range(0, len(keys), 2):
+            yield keys[start:start + 2]
+    
+    async def get_localizations(self, locale: str) -> Dict[str, str]:
+        """Mock getting key -> value pairs for a single locale"""
+        return {
+            self.translation_keys[key_id].key: translations[locale].value
+            for key_id, translations in self.translations.items()
+            if locale in translations
+        }
     
     async def update_translation_key(self, key_id: UUID, update_data: TranslationKeyUpdate) -> Optional[TranslationKey]:
         """Mock updating a translation key"""
-        key_str = str(key_id)
-        if key_str in self.translation_keys:
-            key = self.translation_keys[key_str]
-            if update_data.category is not None:
-                key.category = update_data.category
-            if update_data.description is not None:
-                key.description = update_data.description
-            key.updated_at = "2023-01-01T00:00:00Z"
-            return key
-        return None
+        key_id = _as_uuid(key_id)
+        key = self.translation_keys.get(key_id)
+        if key is None:
+            return None
+        
+        previous_category = key.category
+        key.updated_at = _MOCK_TIMESTAMP
+        if update_data.category is not None:
+            key.category = update_data.category
+        if update_data.description is not None:
+            key.description = update_data.description
+        if key.category != previous_category:
+            self._remove_from_category(previous_category, key_id)
+            self._add_to_category(key.category, key_id)
+        self._index_for_search(key)
+        return self._as_model(key)
     
     async def delete_translation_key(self, key_id: UUID) -> bool:
         """Mock deleting a translation key"""
-        key_str = str(key_id)
-        if key_str in self.translation_keys:
-            del self.translation_keys[key_str]
-            if key_str in self.translations:
-                del self.translations[key_str]
-            return True
-        return False
+        key_id = _as_uuid(key_id)
+        key = self.translation_keys.pop(key_id, None)
+        if key is None:
+            return False
+        
+        del self._key_index[key.key]
+        self._remove_from_category(key.category, key_id)
+        del self._search_index[key_id]
+        self.translations.pop(key_id, None)
+        self._translation_values.pop(key_id, None)
+        return True
     
     async def search_translation_keys(self, search_term: str) -> List[TranslationKey]:
         """Mock searching translation keys"""
         search_lower = search_term.lower()
-        results = []
-        for key in self.translation_keys.values():
-            if (search_lower in key.key.lower() or 
-                search_lower in key.category.lower() or 
-                (key.description and search_lower in key.description.lower())):
-                # Add translations - convert to dict format expected by TranslationKey
-                key.translations = {
-                    lang: {
-                        "value": translation["value"],
-                        "updated_at": translation["updated_at"],
-                        "updated_by": translation["updated_by"]
-                    }
-                    for lang, translation in self.translations.get(key.id, {}).items()
-                }
-                results.append(key)
-        return results
+        return [
+            self._with_translations(self.translation_keys[key_id])
+            for key_id, fields in self._search_index.items()
+            if any(search_lower in field for field in fields)
+        ]
     
-    async def upsert_translation(self, key_id: UUID, language_code: str, translation_data: TranslationCreate) -> Translation:
+    async def upsert_translation(self, key_id: UUID, language_code: str, translation_data: TranslationCreate) -> Optional[Translation]:
         """Mock creating/updating a translation"""
-        key_str = str(key_id)
-        if key_str not in self.translation_keys:
-            raise Exception(f"Translation key not found: {key_id}")
-        
-        if key_str not in self.translations:
-            self.translations[key_str] = {}
+        key_id = _as_uuid(key_id)
+        if key_id not in self.translation_keys:
+            return None
         
-        translation = {
-            "id": str(uuid4()),
-            "translation_key_id": key_id,
-            "language_code": language_code,
-            "value": translation_data.value,
-            "updated_at": "2023-01-01T00:00:00Z",
-            "updated_by": translation_data.updated_by
-        }
-        self.translations[key_str][language_code] = translation
-        return Translation(**translation)
+        return self._store_translation(key_id, language_code, translation_data.value, translation_data.updated_by)
+    
+    async def create_translation(self, key_id: UUID, language_code: str, translation_data: TranslationCreate) -> Optional[Translation]:
+        """Mock creating a translation"""
+        if language_code in self.translations.get(_as_uuid(key_id), {}):
+            raise TranslationAlreadyExistsError("Translation already exists for this language")
+        return await self.upsert_translation(key_id, language_code, translation_data)
     
     async def get_translations_for_key(self, key_id: UUID) -> List[Translation]:
         """Mock getting translations for a key"""
-        key_str = str(key_id)
-        translations = self.translations.get(key_str, {}).values()
-        return [Translation(**t) for t in translations]
+        return list(self.translations.get(_as_uuid(key_id), {}).values())
     
     async def get_translation(self, key_id: UUID, language_code: str) -> Optional[Translation]:
         """Mock getting a specific translation"""
-        key_str = str(key_id)
-        if key_str in self.translations and language_code in self.translations[key_str]:
-            translation_data = self.translations[key_str][language_code]
-            return Translation(**translation_data)
-        return None
+        return self.translations.get(_as_uuid(key_id), {}).get(language_code)
+    
+    async def import_translations(self, translation_keys: List[TranslationKeyCreate], translations: List[Tuple[str, str, str]], updated_by: str) -> None:
+        """Mock upserting translation keys and their translations together"""
+        for key_data in translation_keys:
+            existing_key = await self.get_translation_key_by_key(key_data.key)
+            if existing_key:
+                await self.update_translation_key(existing_key.id, TranslationKeyUpdate(
+                    category=key_data.category,
+                    description=key_data.description
+                ))
+            else:
+                await self.create_translation_key(key_data)
+        
+        await self.bulk_update_translations([
+            BulkTranslationUpdate(
+                translation_key_id=self._key_index[key],
+                language_code=language_code,
+                value=value,
+                updated_by=updated_by
+            )
+            for key, language_code, value in translations
+        ])
     
-    async def bulk_update_translations(self, updates: List[BulkTranslationUpdate]) -> bool:
+    async def bulk_update_translations(self, updates: List[BulkTranslationUpdate]) -> int:
         """Mock bulk updating translations"""
-        try:
-            for update in updates:
-                key_str = str(update.translation_key_id)
-                if key_str not in self.translation_keys:
-                    raise Exception(f"Translation key not found: {update.translation_key_id}")
-                
-                if key_str not in self.translations:
-                    self.translations[key_str] = {}
-                
-                translation = {
-                    "id": str(uuid4()),
-                    "translation_key_id": update.translation_key_id,
-                    "language_code": update.language_code,
-                    "value": update.value,
-                    "updated_at": "2023-01-01T00:00:00Z",
-                    "updated_by": update.updated_by
-                }
-                self.translations[key_str][update.language_code] = translation
-            return True
-        except Exception:
-            return False
+        # Group by key in one pass (last update per language wins)
+        grouped: Dict[UUID, Dict[str, BulkTranslationUpdate]] = defaultdict(dict)
+        for update in updates:
+            grouped[update.translation_key_id][update.language_code] = update
+        
+        # Refuse the whole batch up front if any key is missing, like the foreign key would
+        if grouped.keys() - self.translation_keys.keys():
+            raise APIError({"code": "23503", "message": "insert or update on table \"translations\" violates foreign key constraint"})
+        
+        updated_count = 0
+        for key_id, updates_by_language in grouped.items():
+            for update in updates_by_language.values():
+                self._store_translation(key_id, update.language_code, update.value, update.updated_by)
+            updated_count += len(updates_by_language)
+        return updated_count
     
     async def get_categories(self) -> List[str]:
         """Mock getting all categories"""
-        categories = set()
-        for key in self.translation_keys.values():
-            categories.add(key.category)
-        return sorted(list(categories))
+        if self._categories_sorted is None:
+            self._categories_sorted = sorted(self._by_category)
+        return list(self._categories_sorted)
 
 
-@pytest.fixture(autouse=True)
-def mock_database_service(monkeypatch):
-    """Automatically mock the database service for all tests"""
-    # Set TESTING environment variable to prevent real database connections
-    monkeypatch.setenv("TESTING", "true")
-    
+@pytest.fixture(scope="session")
+def mock_database_service() -> Iterator[MockDatabaseService]:
+    """Mock the database service once for the whole session"""
     mock_service = MockDatabaseService()
     
-    # Replace the global db_service instance
-    import src.localization_management_api.database
-    monkeypatch.setattr(src.localization_management_api.database, "db_service", mock_service)
-    
-    # Also replace it in main.py where it's imported
-    import src.localization_management_api.main
-    monkeypatch.setattr(src.localization_management_api.main, "db_service", mock_service)
-    
-    return mock_service
+    # Endpoints receive the database service through the get_db dependency
+    app.dependency_overrides[get_db] = lambda: mock_service
+    yield mock_service
+    app.dependency_overrides.pop(get_db, None)
 
 
-@pytest_asyncio.fixture
+@pytest.fixture(autouse=True)
+def reset_mock_database_service(request, mock_database_service):
+    """Start every test with an empty mock database instead of rebuilding the mock"""
+    # Read-only tests keep the dataset their class created once
+    if request.node.get_closest_marker("shared_dataset"):
+        return
+    mock_database_service.reset()
+
+
+@pytest_asyncio.fixture(loop_scope="session", scope="session")
 async def client() -> AsyncGenerator[AsyncClient, None]:
     """Create an async HTTP client for testing the API."""
-    from httpx import ASGITransport
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
         yield ac
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_translation_key() -> TranslationKeyCreate:
-    """Create a sample translation key for testing."""
+    """Create a sample translation key once; tests only read it and the mock is reset between tests."""
     return TranslationKeyCreate(
-        key=f"test.key.{uuid4().hex[:8]}",
+        key=f"test.key.{_next_suffix()}",
         category="test",
         description="Test description"
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def sample_translation_key_dump(sample_translation_key: TranslationKeyCreate) -> Dict[str, Any]:
+    """Serialize the sample translation key once for request bodies; copy before changing it."""
+    return sample_translation_key.model_dump()
+
+
+@pytest.fixture(scope="session")
 def sample_translation_keys() -> List[TranslationKeyCreate]:
-    """Create multiple sample translation keys for testing."""
+    """Create multiple sample translation keys once; tests only read them."""
     return [
         TranslationKeyCreate(
-            key=f"test.common.greeting.{uuid4().hex[:8]}",
+            key=f"test.common.greeting.{_next_suffix()}",
             category="common",
             description="Greeting message"
         ),
         TranslationKeyCreate(
-            key=f"test.common.farewell.{uuid4().hex[:8]}",
+            key=f"test.common.farewell.{_next_suffix()}",
             category="common",
             description="Farewell message"
         ),
         TranslationKeyCreate(
-            key=f"test.nav.home.{uuid4().hex[:8]}",
+            key=f"test.nav.home.{_next_suffix()}",
             category="navigation",
             description="Home navigation"
         ),
     ]
 
 
-@pytest.fixture
-def sample_translation() -> TranslationCreate:
-    """Create a sample translation for testing."""
+@pytest_asyncio.fixture
+async def created_key(client: AsyncClient, sample_translation_key_dump: Dict[str, Any]) -> Dict[str, Any]:
+    """Create the sample translation key through the API and return the response body."""
+    response = await client.post("/translation-keys", json=sample_translation_key_dump)
+    assert response.status_code == 200
+    return response.json()
+
+
+@lru_cache(maxsize=None)
+def _build_sample_translation() -> TranslationCreate:
+    """Build the sample translation once; tests treat it as read-only"""
     return TranslationCreate(
         language_code="en",
         value="Hello World",
@@ -285,10 +402,10 @@ def sample_translation() -> TranslationCreate:
     )
 
 
-@pytest.fixture
-def sample_translations() -> List[TranslationCreate]:
-    """Create multiple sample translations for testing."""
-    return [
+@lru_cache(maxsize=None)
+def _build_sample_translations() -> Tuple[TranslationCreate, ...]:
+    """Build the sample translations once; tests treat them as read-only"""
+    return (
         TranslationCreate(
             language_code="en",
             value="Hello",
@@ -304,4 +421,23 @@ def sample_translations() -> List[TranslationCreate]:
             value="Bonjour",
             updated_by="test_user"
         ),
-    ] 
\ No newline at end of file
+    )
+
+
+@pytest.fixture
+def sample_translation() -> TranslationCreate:
+    """Create a sample translation for testing."""
+    return _build_sample_translation()
+
+
+@pytest.fixture(scope="session")
+def sample_translation_dump() -> Dict[str, Any]:
+    """Serialize the sample translation once for request bodies."""
+    return _build_sample_translation().model_dump()
+
+
+@pytest.fixture
+def sample_translations() -> List[TranslationCreate]:
+    """Create multiple sample translations for testing."""
+    return list(_build_sample_translations())
+
@@ -1,7 +1,13 @@
+import asyncio
 import pytest
-from typing import List
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, List, Optional
 from uuid import uuid4
 
+from src.localization_management_api import database
+from src.localization_management_api.database import DatabaseService, KEY_LOOKUP_CHUNK_SIZE
+from postgrest.exceptions import APIError
+
 from src.localization_management_api.models import (
     TranslationKeyCreate, 
     TranslationKeyUpdate,
@@ -10,15 +16,65 @@ from src.localization_management_api.models import (
 )
 
 
+class _StubQuery:
+    """Records a PostgREST query chain and answers it from the stub client's responder"""
+
+    def __init__(self, client: "_StubSupabaseClient", table: str):
+        self.client = client
+        self.table = table
+        self.calls: List[tuple] = []
+
+    def __getattr__(self, name: str) -> Callable[..., "_StubQuery"]:
+        def record(*args: Any, **kwargs: Any) -> "_StubQuery":
+            self.calls.append((name, args, kwargs))
+            return self
+        return record
+
+    def arg(self, name: str) -> Optional[tuple]:
+        """Positional arguments of the last call to the given builder method, if any"""
+        return next((args for call, args, _ in reversed(self.calls) if call == name), None)
+
+    async def execute(self) -> SimpleNamespace:
+        self.client.queries.append(self)
+        return SimpleNamespace(data=await self.client.respond(self))
+
+
+class _StubSupabaseClient:
+    """Stands in for the async Supabase client so the real DatabaseService queries can be checked"""
+
+    def __init__(self):
+        self.queries: List[_StubQuery] = []
+        self.respond: Callable[[_StubQuery], Awaitable[List[dict]]] = self._no_rows
+
+    @staticmethod
+    async def _no_rows(query: _StubQuery) -> List[dict]:
+        return []
+
+    def table(self, name: str) -> _StubQuery:
+        return _StubQuery(self, name)
+
+
+@pytest.fixture
+def stub_supabase(monkeypatch) -> _StubSupabaseClient:
+    """Point the real DatabaseService at a stub client; tests set `respond` to answer queries"""
+    client = _StubSupabaseClient()
+    
+    async def get_stub_client() -> _StubSupabaseClient:
+        return client
+    
+    monkeypatch.setattr(database, "get_supabase_client", get_stub_client)
+    return client
+
+
+@pytest.fixture(scope="class")
+def db_service(mock_database_service):
+    """Get the database service once per class; these tests never go through HTTP"""
+    return mock_database_service
+
+
 class TestDatabaseService:
     """Test the database service layer functionality."""
 
-    @pytest.fixture
-    def db_service(self):
-        """Get the database service (will be mocked automatically)"""
-        from src.localization_management_api.database import db_service
-        return db_service
-
     @pytest.mark.asyncio
     async def test_create_translation_key(self, db_service, sample_translation_key):
         """Test creating a translation key."""
@@ -174,10 +230,7 @@ class TestDatabaseService:
         translations = await db_service.get_translations_for_key(created_key.id)
         
         assert len(translations) == len(sample_translations)
-        language_codes = [t.language_code for t in translations]
-        
-        for sample_translation in sample_translations:
-            assert sample_translation.language_code in language_codes
+        assert {t.language_code for t in translations} >= {t.language_code for t in sample_translations}
 
     @pytest.mark.asyncio
     async def test_bulk_update_translations(self, db_service, sample_translation_keys, sample_translations):
@@ -200,8 +253,8 @@ class TestDatabaseService:
                 ))
         
         # Perform bulk update
-        success = await db_service.bulk_update_translations(bulk_updates)
-        assert success is True
+        updated_count = await db_service.bulk_update_translations(bulk_updates)
+        assert updated_count == len(bulk_updates)
         
         # Verify translations were updated
         for created_key in created_keys:
@@ -220,4 +273,159 @@ class TestDatabaseService:
         # Should contain all unique categories from sample data
         expected_categories = set(key.category for key in sample_translation_keys)
         for expected_category in expected_categories:
-            assert expected_category in categories 
\ No newline at end of file
+            assert expected_category in categories 
+
+
+class TestDatabaseServiceCache:
+    """Test the read cache of the real DatabaseService, with fetches stubbed out."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_fetch_per_key(self):
+        """Test concurrent misses for one key fetch once, while other keys don't wait on it."""
+        service = DatabaseService()
+        release_slow = asyncio.Event()
+        calls = []
+        
+        async def slow_fetch():
+            calls.append("slow")
+            await release_slow.wait()
+            return ["slow"]
+        
+        async def fast_fetch():
+            calls.append("fast")
+            return ["fast"]
+        
+        slow_readers = [asyncio.create_task(service._cached(("slow",), slow_fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        
+        # A miss on another key completes while the slow fetch is still in flight
+        assert await service._cached(("fast",), fast_fetch) == ["fast"]
+        
+        release_slow.set()
+        assert await asyncio.gather(*slow_readers) == [["slow"]] * 3
+        assert calls == ["slow", "fast"]
+
+    @pytest.mark.asyncio
+    async def test_fetch_in_flight_during_invalidation_is_not_cached(self):
+        """Test a fetch that started before a write doesn't store its stale result."""
+        service = DatabaseService()
+        release_fetch = asyncio.Event()
+        versions = iter(["before write", "after write"])
+        
+        async def fetch():
+            value = next(versions)
+            if value == "before write":
+                await release_fetch.wait()
+            return value
+        
+        stale_reader = asyncio.create_task(service._cached(("keys",), fetch))
+        await asyncio.sleep(0)
+        service._invalidate_cache()
+        release_fetch.set()
+        assert await stale_reader == "before write"
+        
+        assert await service._cached(("keys",), fetch) == "after write"
+
+
+class TestDatabaseServiceQueries:
+    """Test the queries the real DatabaseService sends, against a stub Supabase client."""
+
+    @pytest.mark.asyncio
+    async def test_get_existing_key_ids_chunks_the_id_list(self, stub_supabase):
+        """Test large ID sets are looked up in bounded IN lists and the results merged."""
+        key_ids = {uuid4() for _ in range(KEY_LOOKUP_CHUNK_SIZE * 2 + 1)}
+        missing_id = next(iter(key_ids))
+        
+        async def respond(query):
+            return [{"id": key_id} for key_id in query.arg("in_")[1] if key_id != str(missing_id)]
+        
+        stub_supabase.respond = respond
+        existing = await DatabaseService().get_existing_key_ids(key_ids)
+        
+        assert existing == key_ids - {missing_id}
+        chunk_sizes = sorted(len(query.arg("in_")[1]) for query in stub_supabase.queries)
+        assert chunk_sizes == [1, KEY_LOOKUP_CHUNK_SIZE, KEY_LOOKUP_CHUNK_SIZE]
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_translations_dedupes_and_chunks(self, stub_supabase, monkeypatch):
+        """Test the real bulk update keeps the last update per key and language and splits the upsert."""
+        monkeypatch.setattr(database, "BULK_UPSERT_CHUNK_SIZE", 2)
+        key_ids = [uuid4() for _ in range(2)]
+        updates = [
+            BulkTranslationUpdate(translation_key_id=key_id, language_code=language_code, value=value, updated_by="bulk_user")
+            for value in ("first", "final")
+            for key_id in key_ids
+            for language_code in ("en", "es")
+        ] + [BulkTranslationUpdate(translation_key_id=key_ids[0], language_code="pt", value="final", updated_by="bulk_user")]
+        
+        async def respond(query):
+            return query.arg("upsert")[0]
+        
+        stub_supabase.respond = respond
+        updated_count = await DatabaseService().bulk_update_translations(updates)
+        
+        assert updated_count == 5
+        chunks = [query.arg("upsert")[0] for query in stub_supabase.queries]
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        rows = [row for chunk in chunks for row in chunk]
+        assert {(row["translation_key_id"], row["language_code"]) for row in rows} == {
+            (str(key_id), language_code) for key_id in key_ids for language_code in ("en", "es")
+        } | {(str(key_ids[0]), "pt")}
+        assert all(row["value"] == "final" for row in rows)
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_translations_stops_after_failed_chunk(self, stub_supabase, monkeypatch):
+        """Test chunks still waiting to be sent are cancelled once one chunk fails."""
+        monkeypatch.setattr(database, "BULK_UPSERT_CHUNK_SIZE", 1)
+        monkeypatch.setattr(database, "BULK_UPSERT_CONCURRENCY", 1)
+        updates = [
+            BulkTranslationUpdate(translation_key_id=uuid4(), language_code="en", value="value", updated_by="bulk_user")
+            for _ in range(3)
+        ]
+        
+        written = []
+        
+        async def respond(query):
+            if len(stub_supabase.queries) == 1:
+                raise APIError({"code": "23503", "message": "foreign key violation"})
+            # Later chunks take a round trip to land, like a real request
+            await asyncio.sleep(0.01)
+            written.append(query)
+            return query.arg("upsert")[0]
+        
+        stub_supabase.respond = respond
+        with pytest.raises(APIError):
+            await DatabaseService().bulk_update_translations(updates)
+        
+        await asyncio.sleep(0.05)
+        assert written == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("row_count, expected_queries", [(4, 3), (5, 3), (1, 1)])
+    async def test_iter_translation_keys_pages_by_key(self, stub_supabase, monkeypatch, row_count, expected_queries):
+        """Test the keyset loop visits every row once, including when the last page is exactly full."""
+        monkeypatch.setattr(database, "STREAM_PAGE_SIZE", 2)
+        rows = [
+            {
+                "id": str(uuid4()),
+                "key": f"key.{index:02d}",
+                "category": "test",
+                "description": None,
+                "created_at": "2024-01-01T00:00:00+00:00",
+                "updated_at": "2024-01-01T00:00:00+00:00",
+                "translations": [],
+            }
+            for index in range(row_count)
+        ]
+        
+        async def respond(query):
+            after = query.arg("gt")
+            matching = [row for row in rows if after is None or row["key"] > after[1]]
+            return sorted(matching, key=lambda row: row["key"])[:query.arg("limit")[0]]
+        
+        stub_supabase.respond = respond
+        pages = [page async for page in DatabaseService().iter_translation_keys()]
+        
+        assert [key.key for page in pages for key in page] == [row["key"] for row in rows]
+        assert all(0 < len(page) <= 2 for page in pages)
+        assert len(stub_supabase.queries) == expected_queries
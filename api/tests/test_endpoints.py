@@ -1,8 +1,36 @@
+import asyncio
+import json
 import pytest
+import pytest_asyncio
+from fastapi import FastAPI, Request
 from httpx import AsyncClient
+from typing import Any, Dict, List
 from uuid import uuid4
+from postgrest.exceptions import APIError
 
-from src.localization_management_api.models import BulkUpdateRequest, BulkTranslationUpdate
+from src.localization_management_api.database import DatabaseService
+from src.localization_management_api.main import get_db
+from src.localization_management_api.models import BulkUpdateRequest, BulkTranslationUpdate, TranslationCreate, TranslationKey, TranslationKeyCreate
+
+
+async def _create_keys(client: AsyncClient, keys: List[TranslationKeyCreate]) -> List[Dict[str, Any]]:
+    """Create translation keys concurrently and return the response bodies in input order"""
+    responses = await asyncio.gather(*(
+        client.post("/translation-keys", json=key_data.model_dump()) for key_data in keys
+    ))
+    assert all(response.status_code == 200 for response in responses)
+    return [response.json() for response in responses]
+
+
+async def _put_translations(client: AsyncClient, key_id: str, translations: List[TranslationCreate]) -> None:
+    """Store all translations for one key with a single bulk update request"""
+    bulk_request = BulkUpdateRequest(updates=[
+        BulkTranslationUpdate(translation_key_id=key_id, **translation.model_dump())
+        for translation in translations
+    ])
+    response = await client.put("/translation-keys/bulk", json=bulk_request.model_dump(mode="json"))
+    assert response.status_code == 200
+    assert response.json()["data"]["updated_count"] == len(translations)
 
 
 class TestAPIEndpoints:
@@ -19,111 +47,49 @@ class TestAPIEndpoints:
         assert "message" in data
 
     @pytest.mark.asyncio
-    async def test_create_translation_key_success(self, client: AsyncClient, sample_translation_key):
+    async def test_create_translation_key_success(self, created_key, sample_translation_key):
         """Test successfully creating a translation key."""
-        response = await client.post(
-            "/translation-keys",
-            json=sample_translation_key.model_dump()
-        )
+        assert created_key["key"] == sample_translation_key.key
+        assert created_key["category"] == sample_translation_key.category
+        assert created_key["description"] == sample_translation_key.description
+        assert "id" in created_key
+        assert "created_at" in created_key
+        assert "updated_at" in created_key
+
+    @pytest.mark.asyncio
+    async def test_create_translation_key_with_initial_translations(self, client: AsyncClient, sample_translation_key_dump):
+        """Test creating a translation key together with its initial translations."""
+        key_data = dict(sample_translation_key_dump)
+        key_data["initial_translations"] = {"en": "Hello", "es": "Hola"}
+        
+        response = await client.post("/translation-keys", json=key_data)
         
         assert response.status_code == 200
-        data = response.json()
-        assert data["key"] == sample_translation_key.key
-        assert data["category"] == sample_translation_key.category
-        assert data["description"] == sample_translation_key.description
-        assert "id" in data
-        assert "created_at" in data
-        assert "updated_at" in data
+        translations = response.json()["translations"]
+        assert translations["en"]["value"] == "Hello"
+        assert translations["es"]["value"] == "Hola"
 
     @pytest.mark.asyncio
-    async def test_create_duplicate_translation_key(self, client: AsyncClient, sample_translation_key):
+    async def test_create_duplicate_translation_key(self, client: AsyncClient, sample_translation_key_dump):
         """Test creating a duplicate translation key returns error."""
         # Create first key
         response1 = await client.post(
             "/translation-keys",
-            json=sample_translation_key.model_dump()
+            json=sample_translation_key_dump
         )
         assert response1.status_code == 200
         
         # Try to create duplicate
         response2 = await client.post(
             "/translation-keys",
-            json=sample_translation_key.model_dump()
+            json=sample_translation_key_dump
         )
         assert response2.status_code == 400
         assert "already exists" in response2.json()["detail"]
 
     @pytest.mark.asyncio
-    async def test_get_translation_keys(self, client: AsyncClient, sample_translation_keys):
-        """Test retrieving all translation keys."""
-        # Create some keys first
-        created_keys = []
-        for key_data in sample_translation_keys:
-            response = await client.post(
-                "/translation-keys",
-                json=key_data.model_dump()
-            )
-            assert response.status_code == 200
-            created_keys.append(response.json())
-        
-        # Get all keys
-        response = await client.get("/translation-keys")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert isinstance(data, list)
-        assert len(data) >= len(sample_translation_keys)
-        
-        # Verify our created keys are in the response
-        retrieved_keys = {key["key"]: key for key in data}
-        for created_key in created_keys:
-            assert created_key["key"] in retrieved_keys
-
-    @pytest.mark.asyncio
-    async def test_get_translation_keys_by_category(self, client: AsyncClient, sample_translation_keys):
-        """Test filtering translation keys by category."""
-        # Create keys
-        for key_data in sample_translation_keys:
-            await client.post("/translation-keys", json=key_data.model_dump())
-        
-        # Filter by common category
-        response = await client.get("/translation-keys?category=common")
-        assert response.status_code == 200
-        
-        data = response.json()
-        for key in data:
-            if key["key"].startswith("test.common"):  # Our test keys
-                assert key["category"] == "common"
-
-    @pytest.mark.asyncio
-    async def test_search_translation_keys(self, client: AsyncClient, sample_translation_keys):
-        """Test searching translation keys."""
-        # Create keys
-        for key_data in sample_translation_keys:
-            await client.post("/translation-keys", json=key_data.model_dump())
-        
-        # Search for greeting
-        response = await client.get("/translation-keys?search=greeting")
-        assert response.status_code == 200
-        
-        data = response.json()
-        # Should find keys containing "greeting"
-        assert len(data) > 0
-        for key in data:
-            if key["key"].startswith("test."):  # Our test keys
-                assert "greeting" in key["key"].lower() or "greeting" in (key["description"] or "").lower()
-
-    @pytest.mark.asyncio
-    async def test_get_translation_key_by_id(self, client: AsyncClient, sample_translation_key):
+    async def test_get_translation_key_by_id(self, client: AsyncClient, created_key):
         """Test retrieving a specific translation key by ID."""
-        # Create key
-        create_response = await client.post(
-            "/translation-keys",
-            json=sample_translation_key.model_dump()
-        )
-        assert create_response.status_code == 200
-        created_key = create_response.json()
-        
         # Get by ID
         response = await client.get(f"/translation-keys/{created_key['id']}")
         assert response.status_code == 200
@@ -142,21 +108,13 @@ class TestAPIEndpoints:
         assert "not found" in response.json()["detail"]
 
     @pytest.mark.asyncio
-    async def test_update_translation_key(self, client: AsyncClient, sample_translation_key):
-        """Test updating a translation key."""
-        # Create key
-        create_response = await client.post(
-            "/translation-keys",
-            json=sample_translation_key.model_dump()
-        )
-        created_key = create_response.json()
-        
-        # Update key
-        update_data = {
-            "category": "updated_category",
-            "description": "Updated description"
-        }
-        
+    @pytest.mark.parametrize("update_data", [
+        {"category": "updated_category"},
+        {"description": "Updated description"},
+        {"category": "updated_category", "description": "Updated description"},
+    ])
+    async def test_update_translation_key(self, client: AsyncClient, created_key, update_data):
+        """Test updating a translation key, changing only the fields sent."""
         response = await client.put(
             f"/translation-keys/{created_key['id']}",
             json=update_data
@@ -164,20 +122,13 @@ class TestAPIEndpoints:
         
         assert response.status_code == 200
         data = response.json()
-        assert data["category"] == "updated_category"
-        assert data["description"] == "Updated description"
+        assert data["category"] == update_data.get("category", created_key["category"])
+        assert data["description"] == update_data.get("description", created_key["description"])
         assert data["key"] == created_key["key"]  # Key should remain unchanged
 
     @pytest.mark.asyncio
-    async def test_delete_translation_key(self, client: AsyncClient, sample_translation_key):
+    async def test_delete_translation_key(self, client: AsyncClient, created_key):
         """Test deleting a translation key."""
-        # Create key
-        create_response = await client.post(
-            "/translation-keys",
-            json=sample_translation_key.model_dump()
-        )
-        created_key = create_response.json()
-        
         # Delete key
         response = await client.delete(f"/translation-keys/{created_key['id']}")
         assert response.status_code == 200
@@ -191,78 +142,70 @@ class TestAPIEndpoints:
         assert get_response.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_create_translation(self, client: AsyncClient, sample_translation_key, sample_translation):
-        """Test creating a translation for a key."""
-        # Create key first
-        create_response = await client.post(
-            "/translation-keys",
-            json=sample_translation_key.model_dump()
-        )
-        created_key = create_response.json()
+    @pytest.mark.parametrize("method", ["post", "put"])
+    async def test_create_or_upsert_translation(self, client: AsyncClient, created_key, sample_translation, sample_translation_dump, method):
+        """Test creating a translation with POST or PUT, and overwriting it with PUT."""
+        url = f"/translation-keys/{created_key['id']}/translations/{sample_translation.language_code}"
         
-        # Create translation
-        response = await client.post(
-            f"/translation-keys/{created_key['id']}/translations/{sample_translation.language_code}",
-            json=sample_translation.model_dump()
-        )
+        response = await getattr(client, method)(url, json=sample_translation_dump)
         
         assert response.status_code == 200
         data = response.json()
         assert data["language_code"] == sample_translation.language_code
         assert data["value"] == sample_translation.value
         assert data["updated_by"] == sample_translation.updated_by
+        
+        if method == "put":
+            # Update same translation
+            updated_translation = {
+                "language_code": sample_translation.language_code,
+                "value": "Updated value",
+                "updated_by": "updated_user"
+            }
+            
+            response = await client.put(url, json=updated_translation)
+            
+            assert response.status_code == 200
+            data = response.json()
+            assert data["value"] == "Updated value"
+            assert data["updated_by"] == "updated_user"
 
     @pytest.mark.asyncio
-    async def test_upsert_translation(self, client: AsyncClient, sample_translation_key, sample_translation):
-        """Test creating and updating a translation."""
-        # Create key first
-        create_response = await client.post(
-            "/translation-keys",
-            json=sample_translation_key.model_dump()
-        )
-        created_key = create_response.json()
+    async def test_create_duplicate_translation(self, client: AsyncClient, created_key, sample_translation, sample_translation_dump):
+        """Test creating a translation that already exists returns error."""
+        url = f"/translation-keys/{created_key['id']}/translations/{sample_translation.language_code}"
         
-        # Create translation
-        response = await client.put(
-            f"/translation-keys/{created_key['id']}/translations/{sample_translation.language_code}",
-            json=sample_translation.model_dump()
-        )
-        assert response.status_code == 200
-        original_data = response.json()
+        response1 = await client.post(url, json=sample_translation_dump)
+        assert response1.status_code == 200
         
-        # Update same translation
-        updated_translation = {
-            "language_code": sample_translation.language_code,
-            "value": "Updated value",
-            "updated_by": "updated_user"
-        }
+        response2 = await client.post(url, json=sample_translation_dump)
+        assert response2.status_code == 400
+        assert "already exists" in response2.json()["detail"]
+
+    @pytest.mark.asyncio
+    async def test_create_translation_for_nonexistent_key(self, client: AsyncClient, sample_translation, sample_translation_dump):
+        """Test creating or upserting a translation for a non-existent key returns 404."""
+        url = f"/translation-keys/{uuid4()}/translations/{sample_translation.language_code}"
         
-        response = await client.put(
-            f"/translation-keys/{created_key['id']}/translations/{sample_translation.language_code}",
-            json=updated_translation
-        )
+        post_response = await client.post(url, json=sample_translation_dump)
+        assert post_response.status_code == 404
         
-        assert response.status_code == 200
-        data = response.json()
-        assert data["value"] == "Updated value"
-        assert data["updated_by"] == "updated_user"
+        put_response = await client.put(url, json=sample_translation_dump)
+        assert put_response.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_get_translations_for_key(self, client: AsyncClient, sample_translation_key, sample_translations):
-        """Test retrieving all translations for a key."""
-        # Create key
-        create_response = await client.post(
-            "/translation-keys",
-            json=sample_translation_key.model_dump()
-        )
-        created_key = create_response.json()
+    async def test_delete_nonexistent_translation_key(self, client: AsyncClient):
+        """Test deleting a non-existent translation key returns 404."""
+        response = await client.delete(f"/translation-keys/{uuid4()}")
         
+        assert response.status_code == 404
+        assert "not found" in response.json()["detail"]
+
+    @pytest.mark.asyncio
+    async def test_get_translations_for_key(self, client: AsyncClient, created_key, sample_translations):
+        """Test retrieving all translations for a key."""
         # Create multiple translations
-        for translation in sample_translations:
-            await client.put(
-                f"/translation-keys/{created_key['id']}/translations/{translation.language_code}",
-                json=translation.model_dump()
-            )
+        await _put_translations(client, created_key["id"], sample_translations)
         
         # Get all translations
         response = await client.get(f"/translation-keys/{created_key['id']}/translations")
@@ -271,18 +214,13 @@ class TestAPIEndpoints:
         data = response.json()
         assert len(data) == len(sample_translations)
         
-        language_codes = [t["language_code"] for t in data]
-        for sample_translation in sample_translations:
-            assert sample_translation.language_code in language_codes
+        assert {t["language_code"] for t in data} >= {t.language_code for t in sample_translations}
 
     @pytest.mark.asyncio
     async def test_bulk_update_translations(self, client: AsyncClient, sample_translation_keys):
         """Test bulk updating multiple translations."""
         # Create translation keys
-        created_keys = []
-        for key_data in sample_translation_keys[:2]:
-            response = await client.post("/translation-keys", json=key_data.model_dump())
-            created_keys.append(response.json())
+        created_keys = await _create_keys(client, sample_translation_keys[:2])
         
         # Prepare bulk update request
         bulk_updates = []
@@ -325,6 +263,31 @@ class TestAPIEndpoints:
                 if translation["language_code"] in ["en", "es"]:
                     assert translation["updated_by"] == "bulk_user"
 
+    @pytest.mark.asyncio
+    async def test_bulk_update_counts_deduplicated_rows(self, client: AsyncClient, created_key):
+        """Test repeated updates for one key and language are counted once, last value winning."""
+        bulk_request = BulkUpdateRequest(updates=[
+            BulkTranslationUpdate(
+                translation_key_id=created_key["id"],
+                language_code="en",
+                value=value,
+                updated_by="bulk_user"
+            )
+            for value in ("First", "Second", "Final")
+        ])
+
+        response = await client.put(
+            "/translation-keys/bulk",
+            json=bulk_request.model_dump(mode="json")
+        )
+
+        assert response.status_code == 200
+        assert response.json()["data"]["updated_count"] == 1
+
+        translations_response = await client.get(f"/translation-keys/{created_key['id']}/translations")
+        values = {t["language_code"]: t["value"] for t in translations_response.json()}
+        assert values["en"] == "Final"
+
     @pytest.mark.asyncio
     async def test_bulk_update_with_invalid_key(self, client: AsyncClient):
         """Test bulk update with non-existent translation key returns error."""
@@ -348,6 +311,32 @@ class TestAPIEndpoints:
         assert response.status_code == 404
         assert str(fake_uuid) in response.json()["detail"]
 
+    @pytest.mark.asyncio
+    async def test_bulk_update_reports_only_missing_keys(self, client: AsyncClient, created_key):
+        """Test bulk update lists only the missing key IDs when some keys exist."""
+        existing_id = created_key["id"]
+        missing_ids = sorted(str(uuid4()) for _ in range(2))
+        
+        bulk_request = BulkUpdateRequest(updates=[
+            BulkTranslationUpdate(
+                translation_key_id=key_id,
+                language_code="en",
+                value="Test value",
+                updated_by="test_user"
+            )
+            for key_id in [existing_id, *missing_ids]
+        ])
+        
+        response = await client.put(
+            "/translation-keys/bulk",
+            json=bulk_request.model_dump(mode="json")
+        )
+        
+        assert response.status_code == 404
+        detail = response.json()["detail"]
+        assert ", ".join(missing_ids) in detail
+        assert existing_id not in detail
+
     @pytest.mark.asyncio
     async def test_bulk_update_empty_request(self, client: AsyncClient):
         """Test bulk update with empty updates returns error."""
@@ -362,39 +351,10 @@ class TestAPIEndpoints:
         assert "No updates provided" in response.json()["detail"]
 
     @pytest.mark.asyncio
-    async def test_get_categories(self, client: AsyncClient, sample_translation_keys):
-        """Test retrieving all categories."""
-        # Create keys with different categories
-        for key_data in sample_translation_keys:
-            await client.post("/translation-keys", json=key_data.model_dump())
-        
-        response = await client.get("/categories")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert isinstance(data, list)
-        
-        # Should contain our test categories
-        expected_categories = set(key.category for key in sample_translation_keys)
-        actual_categories = set(data)
-        assert expected_categories.issubset(actual_categories)
-
-    @pytest.mark.asyncio
-    async def test_get_localizations_endpoint(self, client: AsyncClient, sample_translation_key, sample_translations):
+    async def test_get_localizations_endpoint(self, client: AsyncClient, created_key, sample_translations):
         """Test the original localizations endpoint with real data."""
-        # Create key and translations
-        create_response = await client.post(
-            "/translation-keys",
-            json=sample_translation_key.model_dump()
-        )
-        created_key = create_response.json()
-        
         # Add translations
-        for translation in sample_translations:
-            await client.put(
-                f"/translation-keys/{created_key['id']}/translations/{translation.language_code}",
-                json=translation.model_dump()
-            )
+        await _put_translations(client, created_key["id"], sample_translations)
         
         # Test localizations endpoint
         response = await client.get("/localizations/test-project/en")
@@ -405,10 +365,27 @@ class TestAPIEndpoints:
         assert data["locale"] == "en"
         assert "localizations" in data
         
-        # Should contain our test key
+        # Should contain our test key, with only the requested locale's value
         localizations = data["localizations"]
-        if created_key["key"] in localizations:
-            assert localizations[created_key["key"]] == "Hello"  # From sample_translations
+        assert localizations[created_key["key"]] == "Hello"  # From sample_translations
+
+    @pytest.mark.asyncio
+    async def test_cacheable_endpoints_revalidate_with_etag(self, client: AsyncClient, sample_translation_keys):
+        """Test categories and localizations send an ETag and answer 304 when it matches."""
+        await _create_keys(client, sample_translation_keys)
+        
+        for url in ("/categories", "/localizations/test-project/en"):
+            response = await client.get(url)
+            assert response.status_code == 200
+            assert "max-age" in response.headers["cache-control"]
+            etag = response.headers["etag"]
+            
+            cached_response = await client.get(url, headers={"If-None-Match": etag})
+            assert cached_response.status_code == 304
+            assert cached_response.headers["etag"] == etag
+            
+            stale_response = await client.get(url, headers={"If-None-Match": '"stale"'})
+            assert stale_response.status_code == 200
 
     @pytest.mark.asyncio
     async def test_csv_bulk_import(self, client: AsyncClient):
@@ -434,4 +411,271 @@ csv.button.save,buttons,Save button,Save,Guardar,Salvar"""
         assert data["data"]["translations_updated"] >= 6  # At least some translations
         
         # Verify CSV endpoint was called successfully
-        assert "CSV import completed successfully" in data["message"] 
\ No newline at end of file
+        assert "CSV import completed successfully" in data["message"] 
+
+    @pytest.mark.asyncio
+    async def test_csv_bulk_import_existing_and_repeated_keys(self, client: AsyncClient):
+        """Test CSV import updates existing keys and creates repeated new keys once."""
+        await client.post(
+            "/translation-keys",
+            json={"key": "csv.existing", "category": "old", "description": None}
+        )
+        csv_data = """key,category,description,en,es,pt
+csv.existing,new,,Existing,,
+csv.repeated,greetings,Repeated key,Hi,,
+csv.repeated,greetings,Repeated key,Hello,,"""
+
+        response = await client.post(
+            "/translation-keys/bulk/csv",
+            json={"csv_data": csv_data, "updated_by": "test_user"}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["created_keys"] == 1
+        assert data["updated_keys"] == 1
+
+    @pytest.mark.asyncio
+    async def test_csv_bulk_import_blank_description_keeps_existing(self, client: AsyncClient):
+        """Test a blank CSV description leaves an existing key's description untouched."""
+        create_response = await client.post(
+            "/translation-keys",
+            json={"key": "csv.described", "category": "greetings", "description": "Kept description"}
+        )
+        csv_data = """key,category,description,en,es,pt
+csv.described,greetings,,Hello,,"""
+
+        response = await client.post(
+            "/translation-keys/bulk/csv",
+            json={"csv_data": csv_data, "updated_by": "test_user"}
+        )
+        
+        assert response.status_code == 200
+        assert response.json()["data"]["updated_keys"] == 0
+        key_response = await client.get(f"/translation-keys/{create_response.json()['id']}")
+        assert key_response.json()["description"] == "Kept description"
+
+    @pytest.mark.asyncio
+    async def test_csv_bulk_import_invalid_row(self, client: AsyncClient):
+        """Test CSV import rejects a row missing a required field and reports its row number."""
+        csv_data = """key,category,description,en,es,pt
+csv.valid,greetings,,Hello,,
+csv.invalid,  ,,Hello,,"""
+
+        response = await client.post(
+            "/translation-keys/bulk/csv",
+            json={"csv_data": csv_data, "updated_by": "test_user"}
+        )
+        
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("Row 3: category")
+        assert response.json()["errors"] == [
+            {"row": 3, "field": "category", "message": "String should have at least 1 character"}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_csv_bulk_import_strict_rejects_before_writing(self, client: AsyncClient):
+        """Test strict CSV import reports invalid rows from every batch and writes nothing."""
+        rows = [f"csv.row{i},bulk,,Value {i},," for i in range(1200)]
+        rows[1] = "csv.row1,,,Value 1,,"  # Row 3, in the first batch
+        rows[1098] = "csv.row1098,,,Value 1098,,"  # Row 1100, in the third batch
+        csv_data = "key,category,description,en,es,pt\n" + "\n".join(rows)
+
+        response = await client.post(
+            "/translation-keys/bulk/csv",
+            json={"csv_data": csv_data, "updated_by": "test_user"}
+        )
+        
+        assert response.status_code == 400
+        assert [error["row"] for error in response.json()["errors"]] == [3, 1100]
+        
+        keys_response = await client.get("/translation-keys")
+        assert keys_response.json() == []
+
+    @pytest.mark.asyncio
+    async def test_csv_bulk_import_strict_caps_reported_errors(self, client: AsyncClient):
+        """Test a strict rejection lists the first 100 errors and counts the rest."""
+        rows = [f"csv.row{i},,,Value {i},," for i in range(150)]
+        csv_data = "key,category,description,en,es,pt\n" + "\n".join(rows)
+
+        response = await client.post(
+            "/translation-keys/bulk/csv",
+            json={"csv_data": csv_data, "updated_by": "test_user"}
+        )
+        
+        assert response.status_code == 400
+        data = response.json()
+        assert [error["row"] for error in data["errors"]] == list(range(2, 102))
+        assert data["error_count"] == 150
+        assert data["detail"].endswith("; and 50 more")
+
+    @pytest.mark.asyncio
+    async def test_csv_bulk_import_non_strict_skips_invalid_rows(self, client: AsyncClient):
+        """Test non-strict CSV import writes valid rows and reports every skipped row."""
+        csv_data = """key,category,description,en,es,pt
+csv.lenient.valid,greetings,,Hello,,
+,greetings,,Missing key,,
+csv.lenient.invalid,,,Missing category,,"""
+
+        response = await client.post(
+            "/translation-keys/bulk/csv",
+            params={"strict": "false"},
+            json={"csv_data": csv_data, "updated_by": "test_user"}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["created_keys"] == 1
+        assert [skipped["row"] for skipped in data["skipped_rows"]] == [3, 4]
+
+    @pytest.mark.asyncio
+    async def test_csv_bulk_import_stream(self, client: AsyncClient):
+        """Test CSV import from a raw text/csv body spanning several batches."""
+        rows = "\n".join(f"csv.stream.{i},stream,,Value {i},," for i in range(1201))
+        
+        response = await client.post(
+            "/translation-keys/bulk/csv/stream",
+            params={"updated_by": "test_user"},
+            content=f"key,category,description,en,es,pt\n{rows}".encode(),
+            headers={"content-type": "text/csv"}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["created_keys"] == 1201
+        assert data["translations_updated"] == 1201
+
+    @pytest.mark.asyncio
+    async def test_csv_bulk_import_stream_rejects_non_utf8(self, client: AsyncClient):
+        """Test a CSV body that is not UTF-8 is rejected as a client error."""
+        response = await client.post(
+            "/translation-keys/bulk/csv/stream",
+            params={"updated_by": "test_user"},
+            content="key,category,description,en,es,pt\ncsv.latin1,greetings,,Olá,,".encode("latin-1"),
+            headers={"content-type": "text/csv"}
+        )
+        
+        assert response.status_code == 400
+        assert response.json()["detail"] == "CSV must be UTF-8 encoded"
+
+    @pytest.mark.asyncio
+    async def test_database_error_is_mapped_to_http_status(self, client: AsyncClient, mock_database_service, monkeypatch):
+        """Test PostgREST errors are translated to HTTP errors by the global handler."""
+        async def raise_api_error():
+            raise APIError({"code": "42501", "message": "permission denied for table translation_keys"})
+        
+        monkeypatch.setattr(mock_database_service, "get_categories", raise_api_error)
+        
+        response = await client.get("/categories")
+        assert response.status_code == 403
+        assert "permission denied" in response.json()["detail"]
+
+    def test_get_db_without_lifespan_builds_one_service(self):
+        """Test the dependency works when the host never ran lifespan, reusing the service it builds."""
+        bare_app = FastAPI()
+        request = Request({"type": "http", "app": bare_app})
+        
+        db_service = get_db(request)
+        
+        assert isinstance(db_service, DatabaseService)
+        assert get_db(request) is db_service
+
+    @pytest.mark.asyncio
+    async def test_unmapped_postgrest_error_returns_generic_500(self, client: AsyncClient, mock_database_service, monkeypatch):
+        """Test database errors without a client status don't echo the database message."""
+        async def raise_api_error():
+            raise APIError({"code": "53300", "message": "too many connections for role \"authenticator\""})
+        
+        monkeypatch.setattr(mock_database_service, "get_categories", raise_api_error)
+        
+        response = await client.get("/categories")
+        assert response.status_code == 500
+        assert response.json() == {"detail": "Internal server error"}
+
+    @pytest.mark.asyncio
+    async def test_unexpected_error_returns_generic_500(self, client: AsyncClient, mock_database_service, monkeypatch):
+        """Test unexpected errors become a 500 that does not echo the exception message."""
+        async def raise_runtime_error():
+            raise RuntimeError("boom internal detail")
+        
+        monkeypatch.setattr(mock_database_service, "get_categories", raise_runtime_error)
+        
+        response = await client.get("/categories")
+        assert response.status_code == 500
+        assert response.json() == {"detail": "Internal server error"}
+
+
+@pytest_asyncio.fixture(scope="class")
+async def populated_keys(mock_database_service, sample_translation_keys) -> List[TranslationKey]:
+    """Seed the sample keys once for a class of read-only tests, straight into the database layer"""
+    mock_database_service.reset()
+    return [await mock_database_service.create_translation_key(key_data) for key_data in sample_translation_keys]
+
+
+@pytest.mark.shared_dataset
+class TestReadOnlyEndpoints:
+    """Test read endpoints against one dataset created per class."""
+
+    @pytest.mark.asyncio
+    async def test_get_translation_keys(self, client: AsyncClient, populated_keys, sample_translation_keys):
+        """Test retrieving all translation keys."""
+        # Get all keys
+        response = await client.get("/translation-keys")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert isinstance(data, list)
+        assert len(data) >= len(sample_translation_keys)
+        
+        # Verify our created keys are in the response
+        wanted_keys = {key.key for key in populated_keys}
+        assert wanted_keys.issubset(key["key"] for key in data)
+
+    @pytest.mark.asyncio
+    async def test_stream_translation_keys(self, client: AsyncClient, populated_keys, sample_translation_keys):
+        """Test streaming translation keys as NDJSON in key order."""
+        response = await client.get("/translation-keys/stream")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        streamed_keys = [json.loads(line)["key"] for line in response.text.splitlines()]
+        assert streamed_keys == sorted(key.key for key in sample_translation_keys)
+
+    @pytest.mark.asyncio
+    async def test_get_translation_keys_by_category(self, client: AsyncClient, populated_keys, sample_translation_keys):
+        """Test filtering translation keys by category."""
+        # Filter by common category
+        response = await client.get("/translation-keys?category=common")
+        assert response.status_code == 200
+        
+        data = response.json()
+        for key in data:
+            if key["key"].startswith("test.common"):  # Our test keys
+                assert key["category"] == "common"
+
+    @pytest.mark.asyncio
+    async def test_search_translation_keys(self, client: AsyncClient, populated_keys, sample_translation_keys):
+        """Test searching translation keys."""
+        # Search for greeting
+        response = await client.get("/translation-keys?search=greeting")
+        assert response.status_code == 200
+        
+        data = response.json()
+        # Should find keys containing "greeting"
+        assert len(data) > 0
+        for key in data:
+            if key["key"].startswith("test."):  # Our test keys
+                assert "greeting" in key["key"].lower() or "greeting" in (key["description"] or "").lower()
+
+    @pytest.mark.asyncio
+    async def test_get_categories(self, client: AsyncClient, populated_keys, sample_translation_keys):
+        """Test retrieving all categories."""
+        response = await client.get("/categories")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert isinstance(data, list)
+        
+        # Should contain our test categories
+        expected_categories = {key.category for key in sample_translation_keys}
+        assert expected_categories.issubset(data)
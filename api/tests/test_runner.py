@@ -6,7 +6,6 @@ Run this script to execute all tests with proper configuration
 
 import sys
 import os
-import subprocess
 from pathlib import Path
 
 def setup_test_environment():
@@ -16,27 +15,20 @@ def setup_test_environment():
     src_dir = api_dir / "src"
     sys.path.insert(0, str(src_dir))
     
-    # Load environment variables from .env file first
-    from dotenv import load_dotenv
-    env_path = api_dir / ".env"
-    load_dotenv(env_path)
+    # Load environment variables from .env file first, unless the shell already provides them
+    if not os.getenv("SUPABASE_URL"):
+        from dotenv import load_dotenv
+        env_path = api_dir / ".env"
+        load_dotenv(env_path)
     
-    # Set test environment variables (you may need to adjust these)
-    test_env = os.environ.copy()
-    test_env.update({
-        "TESTING": "true",
-        "SUPABASE_URL": os.getenv("SUPABASE_URL", ""),
-        "SUPABASE_ANON_KEY": os.getenv("SUPABASE_ANON_KEY", ""),
-        "SUPABASE_SERVICE_ROLE_KEY": os.getenv("SUPABASE_SERVICE_ROLE_KEY", ""),
-        "DEBUG": "true"
-    })
+    # Set test environment variables in this process (you may need to adjust these);
+    # pytest inherits them, so no separate copy of the environment is needed
+    for key in ("SUPABASE_URL", "SUPABASE_ANON_KEY", "SUPABASE_SERVICE_ROLE_KEY"):
+        os.environ.setdefault(key, "")
+    os.environ["TESTING"] = "true"
+    os.environ["DEBUG"] = "true"
     
-    # Set environment variables in current process too
-    for key, value in test_env.items():
-        if key.startswith(("SUPABASE_", "TESTING", "DEBUG")):
-            os.environ[key] = value
-    
-    return test_env
+    return os.environ
 
 def run_tests():
     """Run the test suite"""
@@ -54,19 +46,25 @@ def run_tests():
     
     print("Running tests...")
     
-    # Run pytest
+    # Run pytest in this process, so the interpreter and environment are not set up twice
+    import pytest
     api_dir = Path(__file__).parent.parent
-    cmd = [
-        sys.executable, "-m", "pytest",
+    # Tests import the app as `src.localization_management_api`, relative to the api directory
+    sys.path.insert(0, str(api_dir))
+    args = [
         str(api_dir / "tests"),
-        "-v",
-        "--tb=short",
-        "--asyncio-mode=auto"
+        "-q",
+        "--tb=line",
+        # Skip reading and writing .pytest_cache on every run
+        "-p", "no:cacheprovider",
+        "--asyncio-mode=auto",
+        # Each xdist worker gets its own mock database, so test files can run in parallel
+        "-n", "auto",
+        "--dist=loadfile"
     ]
     
     try:
-        result = subprocess.run(cmd, env=test_env, cwd=str(api_dir))
-        return result.returncode
+        return int(pytest.main(args))
     except KeyboardInterrupt:
         print("\nTests interrupted by user")
         return 1
@@ -1,14 +1,20 @@
-import sys
-import os
+# The package is importable without touching sys.path: vercel.json puts api/src on
+# PYTHONPATH, and `poetry install` installs it from src/ for local runs.
 
-# Ensure the src directory (package code) is on the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 
-# Import the FastAPI application instance
-from localization_management_api import main
+def __getattr__(name: str):
+    # The Vercel Python runtime looks for a module-level variable named `app`
+    # (WSGI or ASGI callable). Expose the FastAPI instance created in main.py,
+    # importing FastAPI, pydantic and supabase only when it is first asked for.
+    if name == "app":
+        from localization_management_api import main
+        return main.app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# The Vercel Python runtime looks for a module-level variable named `app`
-# (WSGI or ASGI callable). Expose the FastAPI instance created in main.py.
-app = main.app  # type: ignore
 
-# Mangum (and handler) removed so that locally (or non-Vercel) the module does not try to import Mangum.
\ No newline at end of file
+def __dir__():
+    # The runtime detects the entrypoint by listing module attributes, so `app` must show up here
+    return ["app"]
+
+
+# Mangum (and handler) removed so that locally (or non-Vercel) the module does not try to import Mangum.
@@ -4,6 +4,9 @@
 -- Extension for UUID generation
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
+-- Extension for trigram indexes (substring search on keys and descriptions)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Translation Keys table
 -- Stores the master list of translation keys with metadata
 CREATE TABLE IF NOT EXISTS translation_keys (
@@ -30,7 +33,11 @@ CREATE TABLE IF NOT EXISTS translations (
 -- Indexes for better query performance
 CREATE INDEX IF NOT EXISTS idx_translation_keys_category ON translation_keys(category);
 CREATE INDEX IF NOT EXISTS idx_translation_keys_key ON translation_keys(key);
-CREATE INDEX IF NOT EXISTS idx_translations_language_code ON translations(language_code);
+CREATE INDEX IF NOT EXISTS idx_translation_keys_key_trgm ON translation_keys USING GIN (key gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_translation_keys_description_trgm ON translation_keys USING GIN (description gin_trgm_ops);
+-- Covering index for per-locale reads: /localizations can be answered by an index-only scan
+DROP INDEX IF EXISTS idx_translations_language_code;
+CREATE INDEX IF NOT EXISTS idx_translations_language_code_covering ON translations(language_code) INCLUDE (translation_key_id, value);
 CREATE INDEX IF NOT EXISTS idx_translations_key_language ON translations(translation_key_id, language_code);
 
 -- Function to automatically update the updated_at timestamp
@@ -42,6 +49,44 @@ BEGIN
 END;
 $$ language 'plpgsql';
 
--- Triggers to automatically update timestamps
+-- Triggers to automatically update timestamps (dropped first so the script can be re-run)
+DROP TRIGGER IF EXISTS update_translation_keys_updated_at ON translation_keys;
 CREATE TRIGGER update_translation_keys_updated_at BEFORE UPDATE ON translation_keys 
-    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column(); 
\ No newline at end of file
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column(); 
+
+-- Distinct categories, computed in the database instead of shipping every row to the API
+CREATE OR REPLACE FUNCTION get_distinct_categories()
+RETURNS TABLE(category TEXT) AS $$
+    SELECT DISTINCT tk.category FROM translation_keys tk ORDER BY tk.category;
+$$ LANGUAGE sql STABLE;
+
+-- Substring search on key or description
+-- The search term is a bound parameter with LIKE wildcards escaped, so it is matched literally
+CREATE OR REPLACE FUNCTION search_keys(q TEXT)
+RETURNS SETOF translation_keys AS $$
+    SELECT * FROM translation_keys
+    WHERE key ILIKE '%' || replace(replace(replace(q, '\', '\\'), '%', '\%'), '_', '\_') || '%'
+       OR description ILIKE '%' || replace(replace(replace(q, '\', '\\'), '%', '\%'), '_', '\_') || '%';
+$$ LANGUAGE sql STABLE;
+
+-- Bulk import of keys and their translations in one call (used by the CSV import)
+-- keys: [{key, category, description}], translations: [{key, language_code, value, updated_by}]
+-- Rows are expanded server-side with jsonb_to_recordset and written with two set-based upserts
+-- A NULL description (blank CSV cell) keeps the existing description, like update_translation_key
+CREATE OR REPLACE FUNCTION import_translations(keys JSONB, translations JSONB)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO translation_keys (key, category, description)
+    SELECT k.key, k.category, k.description
+    FROM jsonb_to_recordset(keys) AS k(key TEXT, category TEXT, description TEXT)
+    ON CONFLICT (key) DO UPDATE
+    SET category = EXCLUDED.category, description = COALESCE(EXCLUDED.description, translation_keys.description);
+
+    INSERT INTO translations (translation_key_id, language_code, value, updated_by)
+    SELECT tk.id, t.language_code, t.value, t.updated_by
+    FROM jsonb_to_recordset(translations) AS t(key TEXT, language_code TEXT, value TEXT, updated_by TEXT)
+    JOIN translation_keys tk ON tk.key = t.key
+    ON CONFLICT (translation_key_id, language_code) DO UPDATE
+    SET value = EXCLUDED.value, updated_by = EXCLUDED.updated_by, updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql;